@@ -1,13 +1,14 @@
 """
 ATS (Applicant Tracking System) Analyzer Module
-Scores resumes against job descriptions using keyword matching and similarity analysis.
+Scores resumes on structure, contact details, action verbs and quantified results.
 """
 
 import streamlit as st
 from pydantic import BaseModel, Field
 from typing import List, Optional
 import re
-from difflib import SequenceMatcher
+
+from utils import trie_pattern
 
 
 class ATSScoreResult(BaseModel):
@@ -21,43 +22,76 @@ class ATSScoreResult(BaseModel):
     improvement_tips: List[str] = Field(description="Actionable improvement suggestions")
 
 
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_NUM_RE = re.compile(r"\b\d+\b|%")
+# Deletion table for the ASCII characters _PUNCT_RE would strip
+_PUNCT_TABLE = {i: None for i in range(128) if _PUNCT_RE.match(chr(i))}
+
+
 def normalize_text(text: str) -> str:
     """Normalize text for comparison."""
     if not text:
         return ""
     text = text.lower()
-    text = re.sub(r'[^\w\s]', '', text)
-    return text
+    if text.isascii():
+        return text.translate(_PUNCT_TABLE)
+    return _PUNCT_RE.sub('', text)
 
 
-ACTION_VERBS = {
+ACTION_VERBS = frozenset({
     'developed', 'implemented', 'created', 'designed', 'built', 'achieved', 'improved', 'optimized',
     'led', 'managed', 'spearheaded', 'directed', 'launched', 'automated', 'increased', 'reduced',
     'analyzed', 'delivered', 'deployed', 'configured', 'debugged', 'architected', 'scaled'
-}
+})
+
+
+# A verb must be a whole whitespace-separated word apart from surrounding punctuation,
+# as in the normalize-then-split count, so "led," matches but "co-led" does not
+_ACTION_RE = re.compile(
+    r'(?<!\S)[^\w\s]*' + trie_pattern(ACTION_VERBS) + r'[^\w\s]*(?!\S)',
+    re.IGNORECASE
+)
 
 
 def count_action_verbs(resume_text: str) -> int:
     """Count occurrences of strong action verbs."""
-    words = normalize_text(resume_text).split()
-    return sum(1 for w in words if w in ACTION_VERBS)
+    return len(_ACTION_RE.findall(resume_text))
 
 
 def count_metric_statements(resume_text: str) -> int:
     """Count occurrences of numbers/percentages indicating quantified impact."""
-    numbers = re.findall(r"\b\d+\b|%", resume_text)
-    return len(numbers)
+    return len(_NUM_RE.findall(resume_text))
+
+
+# Only the verb branch captures, so findall yields '' for every metric hit
+_COMBINED_RE = re.compile(
+    r'(' + _ACTION_RE.pattern + r')|(?:' + _NUM_RE.pattern + r')',
+    re.IGNORECASE
+)
+
+
+def count_impact_signals(resume_text: str) -> tuple:
+    """
+    Count action verbs and metric statements in a single scan.
+
+    Returns:
+        (action_verb_hits, metric_hits)
+    """
+    hits = _COMBINED_RE.findall(resume_text)
+    metric_hits = hits.count('')
+    return len(hits) - metric_hits, metric_hits
 
 
 def has_contact_info(resume_data: dict) -> int:
     """Return a contact score based on presence of email/phone."""
-    email = resume_data.get('email')
-    phone = resume_data.get('phone')
-    if email and phone:
-        return 100
-    if email or phone:
-        return 70
-    return 30
+    email = bool(resume_data.get('email'))
+    phone = bool(resume_data.get('phone'))
+    # 30 baseline, +40 for either contact, +30 more for both
+    return 30 + 40 * (email | phone) + 30 * (email & phone)
+
+
+REQUIRED_SECTIONS = ('summary', 'experience', 'education', 'skills')
+OPTIONAL_SECTIONS = ('projects', 'certifications')
 
 
 def assess_section_completeness(resume_data: dict) -> int:
@@ -65,27 +99,12 @@ def assess_section_completeness(resume_data: dict) -> int:
     Assess completeness of resume sections.
     Expected sections: summary, experience, education, skills, projects, certifications
     """
-    required_sections = ['summary', 'experience', 'education', 'skills']
-    optional_sections = ['projects', 'certifications']
-    
-    completed_required = 0
-    completed_optional = 0
-    
-    for section in required_sections:
-        if section in resume_data and resume_data[section]:
-            if isinstance(resume_data[section], (list, str)):
-                if resume_data[section]:
-                    completed_required += 1
-    
-    for section in optional_sections:
-        if section in resume_data and resume_data[section]:
-            if isinstance(resume_data[section], (list, str)):
-                if resume_data[section]:
-                    completed_optional += 1
+    completed_required = sum(1 for section in REQUIRED_SECTIONS if resume_data.get(section))
+    completed_optional = sum(1 for section in OPTIONAL_SECTIONS if resume_data.get(section))
     
     # Calculate score: 70% for required sections, 30% for optional
-    required_score = int((completed_required / len(required_sections)) * 70)
-    optional_score = int((completed_optional / len(optional_sections)) * 30)
+    required_score = int((completed_required / len(REQUIRED_SECTIONS)) * 70)
+    optional_score = int((completed_optional / len(OPTIONAL_SECTIONS)) * 30)
     
     return min(required_score + optional_score, 100)
 
@@ -116,6 +135,39 @@ def generate_improvement_tips(
         tips.append("✅ Solid foundation. Fine-tune by tailoring keywords to each application.")
 
     return tips
+
+
+def _iter_resume_text(parsed_resume, skill_names):
+    """Yield the free-text fields of a parsed resume in document order."""
+    yield from (parsed_resume.name, parsed_resume.email, parsed_resume.phone, parsed_resume.summary)
+    yield from skill_names
+    for exp in parsed_resume.experience:
+        yield exp.description
+    for edu in parsed_resume.education:
+        yield edu.degree
+    yield from parsed_resume.certifications
+    yield from parsed_resume.projects
+
+
+def build_resume_text(parsed_resume, skill_names: Optional[List[str]] = None) -> str:
+    """
+    Flatten a ParsedResume into one space-separated string for ATS scoring.
+    
+    Args:
+        parsed_resume: ParsedResume to flatten
+        skill_names: Skill names the caller already extracted, reused instead
+            of walking parsed_resume.skills again
+    """
+    if skill_names is None:
+        skill_names = (skill.name for skill in parsed_resume.skills)
+    return " ".join(filter(None, _iter_resume_text(parsed_resume, skill_names)))
+
+
+# Below this many characters there is nothing meaningful to score
+MIN_RESUME_TEXT_LENGTH = 50
+
+
+@st.cache_data(show_spinner=False)
 def calculate_ats_score(
     resume_text: str,
     resume_skills: List[str],
@@ -123,10 +175,20 @@ def calculate_ats_score(
 ) -> ATSScoreResult:
     """Calculate an ATS-style score using only resume signals (no job description)."""
 
+    if not resume_text or len(resume_text.strip()) < MIN_RESUME_TEXT_LENGTH:
+        return ATSScoreResult(
+            ats_score=0,
+            structure_score=0,
+            contact_score=has_contact_info(resume_data),
+            action_verb_score=0,
+            metrics_score=0,
+            strengths=[],
+            improvement_tips=["📄 Upload a complete resume to get an ATS score."]
+        )
+
     structure_score = assess_section_completeness(resume_data)
     contact_score = has_contact_info(resume_data)
-    action_hits = count_action_verbs(resume_text)
-    metric_hits = count_metric_statements(resume_text)
+    action_hits, metric_hits = count_impact_signals(resume_text)
 
     action_verb_score = min(100, action_hits * 10)
     metrics_score = min(100, metric_hits * 15)
@@ -166,11 +228,3 @@ def calculate_ats_score(
         strengths=strengths,
         improvement_tips=improvement_tips
     )
-
-
-def similarity_score(str1: str, str2: str) -> float:
-    """Calculate similarity between two strings (0-100)."""
-    str1 = normalize_text(str1)
-    str2 = normalize_text(str2)
-    ratio = SequenceMatcher(None, str1, str2).ratio()
-    return int(ratio * 100)
@@ -0,0 +1,101 @@
+"""
+Gemini Client Module
+Shared Gemini model factory so every backend module reuses the same clients.
+"""
+
+import streamlit as st
+import google.generativeai as genai
+from typing import Optional
+import os
+import threading
+
+
+DEFAULT_MODEL_NAME = "models/gemini-2.5-flash"
+DEFAULT_TEMPERATURE = 0.7
+# Extraction and scoring should give the same answer every time, and stay cacheable (see llm_cache)
+ANALYSIS_TEMPERATURE = 0.2
+
+# Outcome of configure_api; unlike page-script globals, module globals survive reruns
+_api_configured = None
+_warm_up_started = False
+
+
+def configure_api() -> bool:
+    """
+    Configure the Gemini API key from Streamlit secrets or the environment.
+    
+    The outcome is remembered for the life of the process, so reruns only
+    read a module global instead of going through a cache lookup.
+    
+    Returns:
+        True if an API key was found and configured
+    """
+    global _api_configured
+    if _api_configured is not None:
+        return _api_configured
+    
+    try:
+        api_key = st.secrets.get("GOOGLE_API_KEY")
+        if not api_key:
+            # Try to load from environment variable
+            api_key = os.getenv("GOOGLE_API_KEY")
+    except Exception as e:
+        # Not remembered, so the error is shown again until the setup is fixed
+        st.error(f"API Configuration Error: {e}")
+        return False
+    
+    if api_key:
+        genai.configure(api_key=api_key)
+    _api_configured = bool(api_key)
+    return _api_configured
+
+
+def start_warm_up() -> None:
+    """
+    Open the Gemini connection in a background thread, once per process.
+    
+    count_tokens is free and goes through the same default client as
+    generate_content, so the first real request skips channel setup, auth
+    and the TLS handshake while the user is still reading the landing page.
+    """
+    global _warm_up_started
+    if _warm_up_started:
+        return
+    _warm_up_started = True
+    
+    def warm_up():
+        try:
+            genai.GenerativeModel(DEFAULT_MODEL_NAME).count_tokens("ping")
+        except Exception:
+            # Best effort only; the first real call reports any problem
+            pass
+    
+    threading.Thread(target=warm_up, daemon=True).start()
+
+
+@st.cache_resource
+def get_gemini_model(
+    model_name: str = DEFAULT_MODEL_NAME,
+    temperature: Optional[float] = DEFAULT_TEMPERATURE
+):
+    """
+    Configure Gemini model to return JSON output.
+    
+    Cached per (model_name, temperature), so modules asking for the same
+    configuration share one GenerativeModel and its underlying client.
+    
+    Args:
+        model_name: Gemini model to use
+        temperature: Sampling temperature, or None for the model default
+    
+    Returns:
+        Configured genai.GenerativeModel
+    """
+    generation_config = genai.GenerationConfig(
+        response_mime_type="application/json",
+        temperature=temperature
+    )
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config=generation_config
+    )
@@ -4,9 +4,14 @@ Generates interview questions based on resume and job role.
 """
 
 import streamlit as st
-import google.generativeai as genai
 from pydantic import BaseModel, Field
 from typing import List, Optional
+import io
+import json
+
+from gemini_client import get_gemini_model
+from llm_cache import cached_generate
+from utils import resume_cache_key, job_description_cache_key, title_tokens, JsonFieldScanner
 
 
 class InterviewQuestion(BaseModel):
@@ -27,19 +32,25 @@ class InterviewSet(BaseModel):
     preparation_tips: List[str] = Field(description="General preparation tips")
 
 
-def get_gemini_model():
-    """Configure Gemini model to return JSON output."""
-    generation_config = genai.GenerationConfig(
-        response_mime_type="application/json",
-        temperature=0.7
-    )
-    return genai.GenerativeModel(
-        model_name="models/gemini-2.5-flash",
-        generation_config=generation_config
-    )
+_SECTION_LABELS = {
+    'technical_questions': '💻 Technical',
+    'behavioral_questions': '👥 Behavioral',
+    'role_specific_questions': '🎯 Role-Specific',
+}
+
+
+def _format_section_preview(key: str, raw_value: str) -> str:
+    """Render a streamed question array as a short markdown preview."""
+    label = _SECTION_LABELS[key]
+    try:
+        questions = json.loads(raw_value)
+    except ValueError:
+        return f"**{label}** ready"
+    lines = [f"**{label}** ({len(questions)} ready)"]
+    lines.extend(f"- {q.get('question', '')}" for q in questions if isinstance(q, dict))
+    return "\n".join(lines)
 
 
-@st.cache_data(show_spinner="🎤 Generating interview questions...")
 def generate_interview_questions(
     resume_dict: dict,
     job_description: str,
@@ -49,6 +60,10 @@ def generate_interview_questions(
     """
     Generate interview questions based on resume and job description.
     
+    Results are cached on normalized inputs, so reordered resume keys or
+    whitespace/case-only edits to the job description reuse the previous
+    Gemini response instead of making a new call.
+    
     Args:
         resume_dict: Parsed resume data
         job_description: Job description text
@@ -56,15 +71,46 @@ def generate_interview_questions(
         company_name: Optional company name
     
     Returns:
-        InterviewSet with questions across categories
+        InterviewSet with questions across categories, or None if generation fails
     """
     try:
-        # Format resume for context
-        resume_text = format_resume_for_interview(resume_dict)
-        
-        job_context = f"Job Title: {job_title}\nCompany: {company_name}\n" if job_title else ""
-        
-        prompt = f"""You are an expert interviewer. Generate a comprehensive set of interview questions for a candidate with this background applying for this role.
+        return _generate_interview_questions_cached(
+            resume_cache_key(resume_dict),
+            job_description_cache_key(job_description),
+            job_title,
+            company_name,
+            _resume_dict=resume_dict,
+            _job_description=job_description
+        )
+    except Exception as e:
+        st.error(f"Error generating interview questions: {str(e)}")
+        return None
+
+
+@st.cache_data(show_spinner="🎤 Generating interview questions...", ttl=86400)
+def _generate_interview_questions_cached(
+    resume_key: str,
+    job_description_key: str,
+    job_title: Optional[str],
+    company_name: Optional[str],
+    _resume_dict: dict,
+    _job_description: str
+) -> InterviewSet:
+    """
+    Cached worker for generate_interview_questions.
+    
+    Only the normalized keys and job details are hashed; the underscore-prefixed
+    originals are excluded from the cache key and used to build the prompt.
+    Errors propagate, so a failed call is not cached for the ttl.
+    """
+    resume_dict = _resume_dict
+    job_description = _job_description
+    # Format resume for context
+    resume_text = format_resume_for_interview(resume_dict)
+    
+    job_context = f"Job Title: {job_title}\nCompany: {company_name}\n" if job_title else ""
+    
+    prompt = f"""You are an expert interviewer. Generate a comprehensive set of interview questions for a candidate with this background applying for this role.
 
 CANDIDATE RESUME:
 {resume_text}
@@ -84,80 +130,108 @@ For each question, provide:
 
 Also provide 3-4 general preparation tips for this interview."""
 
-        # Enforce clean JSON output to avoid markdown wrappers
-        prompt += "\n\nReturn only valid JSON with keys: role (string), company_context (string|null), technical_questions (list of {question, category, why_asked, tip}), behavioral_questions (same shape), role_specific_questions (same shape), preparation_tips (list of strings). No extra text or markdown."
-
-        model = get_gemini_model()
-        response = model.generate_content(prompt)
-
-        interview_set = InterviewSet.model_validate_json(response.text)
-        
-        # Update role if provided
-        if job_title:
-            interview_set.role = job_title
-        if company_name:
-            interview_set.company_context = f"Interviewing at {company_name}"
-        
-        return interview_set
-        
-    except Exception as e:
-        st.error(f"Error generating interview questions: {str(e)}")
-        return None
+    # Enforce clean JSON output to avoid markdown wrappers
+    prompt += "\n\nReturn only valid JSON with keys: role (string), company_context (string|null), technical_questions (list of {question, category, why_asked, tip}), behavioral_questions (same shape), role_specific_questions (same shape), preparation_tips (list of strings). No extra text or markdown."
+
+    # Preview each question category as soon as its array arrives; the
+    # placeholder is created here so cache hits replay it cleanly.
+    scanner = JsonFieldScanner()
+    preview = st.empty()
+    ready_sections = []
+
+    def show_progress(chunk: str):
+        for key, raw_value in scanner.feed(chunk):
+            if key in _SECTION_LABELS:
+                ready_sections.append(_format_section_preview(key, raw_value))
+                preview.markdown("\n\n".join(ready_sections))
+
+    # Questions are sampled at the default temperature, so the response cache
+    # passes them straight through and each uncached run gets a fresh set
+    model = get_gemini_model()
+    response_text = cached_generate(model, prompt, tag="interview_questions", on_text=show_progress)
+    preview.empty()
+
+    interview_set = InterviewSet.model_validate_json(response_text)
+    
+    # Update role if provided
+    if job_title:
+        interview_set.role = job_title
+    if company_name:
+        interview_set.company_context = f"Interviewing at {company_name}"
+    
+    return interview_set
+
+
+def _format_entry(primary: Optional[str], joiner: str, secondary: Optional[str], when: Optional[str]) -> str:
+    """
+    Format a "primary<joiner>secondary (when)" line, leaving out missing fields.
+    
+    Returns an empty string when every field is missing, so callers can skip
+    the line instead of sending "Unknown"/"None" placeholders to the LLM.
+    """
+    entry = joiner.join(part for part in (primary, secondary) if part)
+    if when:
+        entry = f"{entry} ({when})" if entry else f"({when})"
+    return entry
 
 
 def format_resume_for_interview(resume_dict: dict) -> str:
     """Format resume for interview question generation."""
-    text_parts = []
+    # Every line is written with a trailing newline; the last one is dropped on return
+    buf = io.StringIO()
+    write = buf.write
     
     if resume_dict.get('name'):
-        text_parts.append(f"Candidate: {resume_dict['name']}")
+        write(f"Candidate: {resume_dict['name']}\n")
     
     if resume_dict.get('summary'):
-        text_parts.append(f"\nProfessional Summary:\n{resume_dict['summary']}")
+        write(f"\nProfessional Summary:\n{resume_dict['summary']}\n")
     
     if resume_dict.get('experience'):
-        text_parts.append("\nWork Experience:")
+        write("\nWork Experience:\n")
         for i, exp in enumerate(resume_dict['experience'], 1):
             if isinstance(exp, dict):
-                text_parts.append(
-                    f"{i}. {exp.get('title', 'Unknown')} at {exp.get('company', 'Unknown')} "
-                    f"({exp.get('duration', 'Unknown')})"
-                )
+                heading = _format_entry(exp.get('title'), ' at ', exp.get('company'), exp.get('duration'))
+                if heading:
+                    write(f"{i}. {heading}\n")
                 if exp.get('description'):
-                    text_parts.append(f"   {exp['description']}")
+                    write(f"   {exp['description']}\n")
     
     if resume_dict.get('skills'):
-        text_parts.append("\nKey Skills:")
+        write("\nKey Skills:\n")
         skills = resume_dict['skills']
         skill_list = []
         if isinstance(skills, list):
-            if skills and isinstance(skills[0], dict):
-                skill_list = [skill.get('name', str(skill)) for skill in skills]
+            # Only the first 15 skills are used, so slice before converting
+            head = skills[:15]
+            if head and isinstance(head[0], dict):
+                skill_list = [skill.get('name', str(skill)) for skill in head]
             else:
-                skill_list = [str(skill) for skill in skills]
-        text_parts.append(", ".join(skill_list[:15]))
+                skill_list = [str(skill) for skill in head]
+        write(", ".join(skill_list))
+        write("\n")
     
     if resume_dict.get('education'):
-        text_parts.append("\nEducation:")
+        write("\nEducation:\n")
         for edu in resume_dict['education']:
             if isinstance(edu, dict):
-                text_parts.append(
-                    f"- {edu.get('degree', 'Unknown')} from "
-                    f"{edu.get('institution', 'Unknown')} "
-                    f"({edu.get('graduation_year', 'Unknown')})"
+                entry = _format_entry(
+                    edu.get('degree'), ' from ', edu.get('institution'), edu.get('graduation_year')
                 )
+                if entry:
+                    write(f"- {entry}\n")
     
     if resume_dict.get('certifications'):
-        text_parts.append("\nCertifications:")
+        write("\nCertifications:\n")
         for cert in resume_dict['certifications']:
-            text_parts.append(f"- {cert}")
+            write(f"- {cert}\n")
     
     if resume_dict.get('projects'):
-        text_parts.append("\nProjects:")
+        write("\nProjects:\n")
         for project in resume_dict['projects'][:3]:
-            text_parts.append(f"- {project}")
+            write(f"- {project}\n")
     
-    return "\n".join(text_parts)
+    return buf.getvalue()[:-1]
 
 
 # Common behavioral interview questions
@@ -247,6 +321,15 @@ TECHNICAL_QUESTIONS_BY_DOMAIN = {
 }
 
 
+# Validated once at import so template-based generation skips per-call validation;
+# each InterviewSet gets its own copies so edits to one set never leak into another
+_BEHAVIORAL_QUESTION_OBJS = tuple(InterviewQuestion(**q) for q in COMMON_BEHAVIORAL_QUESTIONS)
+_TECHNICAL_QUESTION_OBJS = {
+    domain: tuple(InterviewQuestion(**q) for q in questions)
+    for domain, questions in TECHNICAL_QUESTIONS_BY_DOMAIN.items()
+}
+
+
 def get_behavioral_questions() -> List[dict]:
     """Get common behavioral interview questions."""
     return COMMON_BEHAVIORAL_QUESTIONS
@@ -274,65 +357,72 @@ def generate_simple_questions(
     # Identify domain
     domain = identify_domain(job_title)
     
-    technical_qs = get_technical_questions(domain)
-    behavioral_qs = get_behavioral_questions()
-    
     # Role-specific questions based on title
     role_specific_qs = generate_role_specific_questions(job_title, skills)
     
     return InterviewSet(
         role=job_title,
         company_context=None,
-        technical_questions=[InterviewQuestion(**q) for q in technical_qs[:3]],
-        behavioral_questions=[InterviewQuestion(**q) for q in behavioral_qs[:3]],
+        technical_questions=[q.model_copy() for q in _TECHNICAL_QUESTION_OBJS.get(domain, ())[:3]],
+        behavioral_questions=[q.model_copy() for q in _BEHAVIORAL_QUESTION_OBJS[:3]],
         role_specific_questions=role_specific_qs,
         preparation_tips=get_preparation_tips(job_title)
     )
 
 
+# Job-title keywords, matched against whole words of the title
+_BACKEND_KWS = frozenset({'backend', 'server', 'api'})
+_FRONTEND_KWS = frozenset({'frontend', 'ui', 'ux', 'react', 'vue'})
+_DATA_KWS = frozenset({'data', 'ml', 'ai', 'science'})
+# Word forms the original substring checks also caught ("Engineering Manager", "Team Leader")
+_TECH_KWS = frozenset({
+    'technical', 'developer', 'developers', 'engineer', 'engineers', 'engineering', 'backend', 'frontend'
+})
+_LEAD_KWS = frozenset({'lead', 'leads', 'leader', 'leadership', 'architect', 'architects'})
+_MANAGER_KWS = frozenset({'manager', 'managers'})
+_LEADERSHIP_KWS = _MANAGER_KWS | {'lead', 'leads', 'leader', 'leadership', 'senior'}
+
+
 def identify_domain(job_title: str) -> str:
     """Identify job domain from title."""
-    job_title_lower = job_title.lower()
+    tokens = title_tokens(job_title)
     
-    if any(word in job_title_lower for word in ['backend', 'server', 'api']):
+    if tokens & _BACKEND_KWS:
         return 'backend'
-    elif any(word in job_title_lower for word in ['frontend', 'ui', 'ux', 'react', 'vue']):
+    elif tokens & _FRONTEND_KWS:
         return 'frontend'
-    elif any(word in job_title_lower for word in ['data', 'ml', 'ai', 'science']):
+    elif tokens & _DATA_KWS:
         return 'data-science'
     
     return 'general'
 
 
+_ROLE_SPECIFIC_RULES = (
+    (frozenset({'senior'}), InterviewQuestion(
+        question="How do you approach mentoring junior developers?",
+        category="role-specific",
+        why_asked="Tests leadership and mentoring capability",
+        tip="Share examples of how you've helped others grow."
+    )),
+    (_LEAD_KWS, InterviewQuestion(
+        question="Tell me about a major technical decision you made and how you communicated it to stakeholders.",
+        category="role-specific",
+        why_asked="Evaluates technical leadership and communication",
+        tip="Show how you balanced technical and business considerations."
+    )),
+    (_MANAGER_KWS, InterviewQuestion(
+        question="How do you handle performance issues with team members?",
+        category="role-specific",
+        why_asked="Tests people management skills",
+        tip="Discuss constructive feedback and development."
+    )),
+)
+
+
 def generate_role_specific_questions(job_title: str, skills: List[str]) -> List[InterviewQuestion]:
     """Generate questions specific to the role."""
-    questions = []
-    
-    job_title_lower = job_title.lower()
-    
-    if 'senior' in job_title_lower:
-        questions.append(InterviewQuestion(
-            question="How do you approach mentoring junior developers?",
-            category="role-specific",
-            why_asked="Tests leadership and mentoring capability",
-            tip="Share examples of how you've helped others grow."
-        ))
-    
-    if 'lead' in job_title_lower or 'architect' in job_title_lower:
-        questions.append(InterviewQuestion(
-            question="Tell me about a major technical decision you made and how you communicated it to stakeholders.",
-            category="role-specific",
-            why_asked="Evaluates technical leadership and communication",
-            tip="Show how you balanced technical and business considerations."
-        ))
-    
-    if 'manager' in job_title_lower:
-        questions.append(InterviewQuestion(
-            question="How do you handle performance issues with team members?",
-            category="role-specific",
-            why_asked="Tests people management skills",
-            tip="Discuss constructive feedback and development."
-        ))
+    tokens = title_tokens(job_title)
+    questions = [question.model_copy() for keywords, question in _ROLE_SPECIFIC_RULES if tokens & keywords]
     
     # Default role-specific question
     if not questions:
@@ -346,28 +436,37 @@ def generate_role_specific_questions(job_title: str, skills: List[str]) -> List[
     return questions
 
 
+_BASE_TIPS = (
+    "✅ Research the company: mission, values, recent news",
+    "✅ Review the job description thoroughly and note key requirements",
+    "✅ Prepare STAR format examples for behavioral questions",
+    "✅ Practice talking about your projects and quantify results",
+    "✅ Prepare thoughtful questions to ask the interviewer",
+)
+
+_TIP_RULES = (
+    (_TECH_KWS, (
+        "✅ Be ready for technical problem-solving during the interview",
+        "✅ Explain your thought process clearly, not just the solution",
+    )),
+    (_DATA_KWS, (
+        "✅ Prepare to discuss a recent ML project in detail",
+        "✅ Be ready to discuss trade-offs in model selection",
+    )),
+    (_LEADERSHIP_KWS, (
+        "✅ Prepare examples of team leadership and conflict resolution",
+        "✅ Discuss how you foster team growth and development",
+    )),
+)
+
+
 def get_preparation_tips(job_title: str) -> List[str]:
     """Get preparation tips specific to the job."""
-    tips = [
-        "✅ Research the company: mission, values, recent news",
-        "✅ Review the job description thoroughly and note key requirements",
-        "✅ Prepare STAR format examples for behavioral questions",
-        "✅ Practice talking about your projects and quantify results",
-        "✅ Prepare thoughtful questions to ask the interviewer"
-    ]
-    
-    job_title_lower = job_title.lower()
-    
-    if any(word in job_title_lower for word in ['technical', 'developer', 'engineer', 'backend', 'frontend']):
-        tips.append("✅ Be ready for technical problem-solving during the interview")
-        tips.append("✅ Explain your thought process clearly, not just the solution")
-    
-    if any(word in job_title_lower for word in ['data', 'ml', 'ai', 'science']):
-        tips.append("✅ Prepare to discuss a recent ML project in detail")
-        tips.append("✅ Be ready to discuss trade-offs in model selection")
+    tokens = title_tokens(job_title)
+    tips = list(_BASE_TIPS)
     
-    if any(word in job_title_lower for word in ['manager', 'lead', 'senior']):
-        tips.append("✅ Prepare examples of team leadership and conflict resolution")
-        tips.append("✅ Discuss how you foster team growth and development")
+    for keywords, extra_tips in _TIP_RULES:
+        if tokens & keywords:
+            tips.extend(extra_tips)
     
     return tips
@@ -4,10 +4,14 @@ Matches resume against job descriptions and identifies alignment.
 """
 
 import streamlit as st
-import google.generativeai as genai
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from difflib import SequenceMatcher
+import re
+
+from gemini_client import ANALYSIS_TEMPERATURE, get_gemini_model
+from llm_cache import cached_generate_many
+from resume_rewriter import format_resume_for_analysis
+from utils import build_resume_job_prompt
 
 
 class JobMatchResult(BaseModel):
@@ -30,18 +34,6 @@ class SampleJob(BaseModel):
     required_skills: List[str]
 
 
-def get_gemini_model():
-    """Configure Gemini model to return JSON output."""
-    generation_config = genai.GenerationConfig(
-        response_mime_type="application/json",
-        temperature=0.7
-    )
-    return genai.GenerativeModel(
-        model_name="models/gemini-2.5-flash",
-        generation_config=generation_config
-    )
-
-
 # Sample job descriptions for demonstration
 SAMPLE_JOBS = [
     SampleJob(
@@ -109,129 +101,69 @@ SAMPLE_JOBS = [
 ]
 
 
-@st.cache_data(show_spinner="🎯 Analyzing job match...")
-def match_resume_with_job(
-    resume_dict: dict,
-    job_description: str
-) -> JobMatchResult:
+# JSON shape of JobMatchResult, shared with the combined resume pipeline prompt
+MATCH_JSON_KEYS = (
+    "match_percentage (0-100 int), job_title_match (string), matching_skills (list of strings), "
+    "missing_skills (list of strings), matching_experience (list of strings), growth_areas "
+    "(list of strings), suitability_assessment (string), career_alignment (string)"
+)
+
+
+# The JSON response mime type already rules out markdown, so the prompt only names the keys
+MATCH_INSTRUCTIONS = f"""You are a career advisor and job matching expert. Give a realistic, constructive assessment of how well the resume above matches the job description above.
+
+Return JSON with keys: {MATCH_JSON_KEYS}."""
+
+
+def build_match_prompt(resume_text: str, job_description: str) -> str:
+    """Build the job match prompt for formatted resume text and a job description."""
+    return build_resume_job_prompt(resume_text, job_description, MATCH_INSTRUCTIONS)
+
+
+def match_resume_with_sample_jobs(resume_dict: dict) -> List[Optional[JobMatchResult]]:
     """
-    Match resume with job description using AI analysis.
+    Match a resume against every sample job with concurrent Gemini requests.
     
     Args:
         resume_dict: Parsed resume dictionary
-        job_description: Job description text
     
     Returns:
-        JobMatchResult object
+        JobMatchResult (or None where a response was invalid) per job, in SAMPLE_JOBS order,
+        or an empty list if the requests fail
     """
     try:
-        # Format resume for analysis
-        resume_text = format_resume_for_job_match(resume_dict)
-        
-        prompt = f"""You are a career advisor and job matching expert. Analyze how well this resume matches the job description.
-
-RESUME:
-{resume_text}
-
-JOB DESCRIPTION:
-{job_description}
-
-Provide:
-1. Overall match percentage (0-100)
-2. Assessment of job title fit
-3. Skills that match the job
-4. Missing required skills
-5. Relevant experience areas
-6. Growth areas to develop
-7. Overall suitability assessment
-8. Career alignment assessment
-
-Be realistic and constructive in your analysis."""
-
-        # Enforce clean JSON output to avoid markdown wrappers
-        prompt += "\n\nReturn only valid JSON with keys: match_percentage (0-100 int), job_title_match (string), matching_skills (list of strings), missing_skills (list of strings), matching_experience (list of strings), growth_areas (list of strings), suitability_assessment (string), career_alignment (string). No extra commentary or markdown."
-
-        model = get_gemini_model()
-        response = model.generate_content(prompt)
-
-        result = JobMatchResult.model_validate_json(response.text)
-        return result
-        
+        return _match_resume_with_sample_jobs_cached(resume_dict)
     except Exception as e:
-        st.error(f"Error analyzing job match: {str(e)}")
-        return None
+        st.error(f"Error analyzing job matches: {str(e)}")
+        return []
 
 
-def format_resume_for_job_match(resume_dict: dict) -> str:
-    """Format resume for job matching analysis."""
-    text_parts = []
-    
-    if resume_dict.get('name'):
-        text_parts.append(f"Name: {resume_dict['name']}")
-    
-    if resume_dict.get('summary'):
-        text_parts.append(f"\nProfessional Summary:\n{resume_dict['summary']}")
-    
-    if resume_dict.get('experience'):
-        text_parts.append("\nProfessional Experience:")
-        for exp in resume_dict['experience']:
-            if isinstance(exp, dict):
-                text_parts.append(
-                    f"- {exp.get('title', 'Unknown')} at {exp.get('company', 'Unknown')} "
-                    f"({exp.get('duration', 'Unknown')})"
-                )
-                if exp.get('description'):
-                    text_parts.append(f"  {exp['description']}")
+@st.cache_data(show_spinner="🎯 Matching against all sample jobs...", persist="disk", max_entries=500)
+def _match_resume_with_sample_jobs_cached(resume_dict: dict) -> List[Optional[JobMatchResult]]:
+    """Cached worker for match_resume_with_sample_jobs; request errors propagate uncached."""
+    resume_text = format_resume_for_analysis(resume_dict)
+    prompts = [build_match_prompt(resume_text, job.description) for job in SAMPLE_JOBS]
+    response_texts = cached_generate_many(get_gemini_model(temperature=ANALYSIS_TEMPERATURE), prompts, tag="job_match")
     
-    if resume_dict.get('skills'):
-        text_parts.append("\nTechnical Skills:")
-        skills = resume_dict['skills']
-        if isinstance(skills, list):
-            if skills and isinstance(skills[0], dict):
-                skill_names = [skill.get('name', str(skill)) for skill in skills]
-            else:
-                skill_names = [str(skill) for skill in skills]
-            text_parts.append(", ".join(skill_names[:20]))
-    
-    if resume_dict.get('education'):
-        text_parts.append("\nEducation:")
-        for edu in resume_dict['education']:
-            if isinstance(edu, dict):
-                text_parts.append(
-                    f"- {edu.get('degree', 'Unknown')} in "
-                    f"{edu.get('institution', 'Unknown')}"
-                )
-    
-    if resume_dict.get('certifications'):
-        text_parts.append("\nCertifications:")
-        for cert in resume_dict['certifications']:
-            text_parts.append(f"- {cert}")
-    
-    return "\n".join(text_parts)
+    results = []
+    for text in response_texts:
+        try:
+            results.append(JobMatchResult.model_validate_json(text))
+        except ValueError:
+            results.append(None)
+    return results
 
 
-def calculate_simple_skill_match(
-    resume_skills: List[str],
-    job_required_skills: List[str]
-) -> tuple:
-    """
-    Calculate simple skill match without LLM.
-    
-    Returns:
-        (matching_skills, missing_skills, match_percentage)
-    """
-    resume_skills_lower = {skill.lower() for skill in resume_skills}
-    job_skills_lower = {skill.lower() for skill in job_required_skills}
-    
-    matching = resume_skills_lower.intersection(job_skills_lower)
-    missing = job_skills_lower - resume_skills_lower
-    
-    if len(job_skills_lower) == 0:
-        match_pct = 0
-    else:
-        match_pct = int((len(matching) / len(job_skills_lower)) * 100)
-    
-    return list(matching), list(missing), match_pct
+EXPERIENCE_KEYWORDS = (
+    'develop', 'design', 'implement', 'build', 'create',
+    'manage', 'lead', 'coordinate', 'analyze', 'optimize',
+    'test', 'deploy', 'architect', 'scale', 'improve'
+)
+
+_EXPERIENCE_KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(EXPERIENCE_KEYWORDS) + r')\w*',
+    re.IGNORECASE
+)
 
 
 def calculate_experience_match(
@@ -242,20 +174,14 @@ def calculate_experience_match(
     Estimate experience relevance based on keywords.
     Returns match percentage (0-100).
     """
-    job_keywords = {
-        'develop', 'design', 'implement', 'build', 'create',
-        'manage', 'lead', 'coordinate', 'analyze', 'optimize',
-        'test', 'deploy', 'architect', 'scale', 'improve'
-    }
-    
     total_score = 0
     count = 0
     
     for exp in resume_experience:
         if isinstance(exp, dict) and exp.get('description'):
-            description = exp['description'].lower()
-            found_keywords = sum(1 for kw in job_keywords if kw in description)
-            score = min(int((found_keywords / len(job_keywords)) * 100), 100)
+            # Distinct keyword stems found at the start of a word, in one regex pass
+            found_keywords = len({kw.lower() for kw in _EXPERIENCE_KEYWORD_RE.findall(exp['description'])})
+            score = min(int((found_keywords / len(EXPERIENCE_KEYWORDS)) * 100), 100)
             total_score += score
             count += 1
     
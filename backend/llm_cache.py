@@ -0,0 +1,419 @@
+"""
+LLM Response Cache Module
+Exact and semantic caching for Gemini calls, persisted to disk.
+"""
+
+import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+import numpy as np
+from typing import Any, Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+EMBEDDING_MODEL = "models/text-embedding-004"
+SIMILARITY_THRESHOLD = 0.92
+# Newest responses kept in memory and on disk; the oldest are evicted first
+MAX_EXACT_ENTRIES = 5000
+# Newest embeddings kept for semantic lookup; older rows are dropped (their exact entries stay)
+MAX_SEMANTIC_ENTRIES = 2000
+# Seconds to wait for another caller generating the same prompt before calling the LLM directly
+INFLIGHT_WAIT_TIMEOUT = 180.0
+# Responses sampled above this temperature are meant to vary between calls, so they are never cached
+MAX_CACHEABLE_TEMPERATURE = 0.3
+
+# Seconds the background writer waits after a change, so a burst of stores is written once
+SAVE_DELAY = 0.5
+
+# Rate-limit (429) and unavailable (503) responses are retried with full-jitter
+# exponential backoff: attempt n sleeps a random 0..min(MAX, BASE * 2**n) seconds.
+# The caller's thread sleeps at most 1 + 2 + 4 + 8 = 15 s before the fifth and
+# final attempt (7.5 s on average), on top of the requests themselves.
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+_lock = threading.Lock()
+_exact = {}            # prompt key -> {"tag", "created", "text"}
+_vectors = None        # (N, dim) float32 array of unit-length embeddings
+_vector_entries = []   # per-row {"tag", "scope", "created", "key"}
+_inflight = {}         # prompt key -> Event set when the generating call finishes
+_loaded = False
+_save_lock = threading.Lock()
+_generation = 0        # bumped on every change, so _save can skip outdated snapshots
+_saved_generation = 0
+_dirty = threading.Event()  # wakes the background writer
+_writer_started = False
+
+
+def _generation_config(model) -> dict:
+    """The generation settings (temperature, response type, ...) a model was built with."""
+    return getattr(model, "_generation_config", None) or {}
+
+
+def _is_cacheable(model) -> bool:
+    """
+    Check whether a model's responses may be cached.
+    
+    Only explicit temperatures up to MAX_CACHEABLE_TEMPERATURE qualify; None
+    means the model's own default, which samples freely.
+    """
+    temperature = _generation_config(model).get("temperature")
+    return temperature is not None and temperature <= MAX_CACHEABLE_TEMPERATURE
+
+
+def _prompt_key(model, prompt) -> str:
+    """SHA-256 over the model name, its generation config and every prompt part (including file bytes)."""
+    digest = hashlib.sha256()
+
+    def add(kind: bytes, data: bytes):
+        # Kind and length prefixes keep ["ab", "c"] and ["a", "bc"] (or text vs file parts) apart
+        digest.update(kind + len(data).to_bytes(8, "big"))
+        digest.update(data)
+
+    add(b"M", getattr(model, "model_name", "").encode())
+    add(b"C", json.dumps(_generation_config(model), sort_keys=True, default=str).encode())
+    parts = prompt if isinstance(prompt, list) else [prompt]
+    for part in parts:
+        if isinstance(part, dict):
+            add(b"F", str(part.get("mime_type", "")).encode())
+            data = part.get("data", b"")
+            add(b"D", data if isinstance(data, bytes) else str(data).encode())
+        else:
+            add(b"T", str(part).encode())
+    return digest.hexdigest()
+
+
+def _is_fresh(entry: dict, ttl: Optional[int]) -> bool:
+    """Check whether a cache entry is younger than ttl seconds."""
+    return ttl is None or time.time() - entry["created"] <= ttl
+
+
+def _load():
+    """Load the persisted cache from disk once per process."""
+    global _vectors, _vector_entries, _loaded
+    if _loaded:
+        return
+    _loaded = True
+    # Missing or corrupt cache files just mean a (partially) cold cache
+    try:
+        with open(os.path.join(CACHE_DIR, "responses.json"), encoding="utf-8") as f:
+            for key, entry in json.load(f).items():
+                _store(key, entry)
+    except (OSError, ValueError):
+        pass
+    try:
+        with np.load(os.path.join(CACHE_DIR, "semantic.npz")) as data:
+            vectors = data["vectors"]
+            entries = json.loads(str(data["entries"]))
+    except Exception:
+        return
+    if len(entries) == len(vectors):
+        _vectors, _vector_entries = vectors, entries
+
+
+def _store(key: str, entry: dict):
+    """Add a response as the newest entry, evicting the oldest beyond MAX_EXACT_ENTRIES (hold _lock)."""
+    _exact.pop(key, None)
+    _exact[key] = entry
+    while len(_exact) > MAX_EXACT_ENTRIES:
+        del _exact[next(iter(_exact))]
+
+
+def _snapshot() -> tuple:
+    """Capture the cache state for _save (hold _lock); entries and arrays are never mutated in place."""
+    return _generation, dict(_exact), _vectors, list(_vector_entries)
+
+
+def _schedule_save():
+    """
+    Mark the cache changed and wake the background writer (hold _lock).
+    
+    Callers never wait on disk I/O: serializing and fsyncing the cache files
+    happens on the writer thread, which holds _lock only to copy the entries
+    (a shallow copy of at most MAX_EXACT_ENTRIES items, around a millisecond)
+    before writing outside it.
+    """
+    global _generation, _writer_started
+    _generation += 1
+    if not _writer_started:
+        _writer_started = True
+        threading.Thread(target=_write_loop, daemon=True).start()
+    _dirty.set()
+
+
+def _write_loop():
+    """Background writer: persist the cache shortly after each burst of changes."""
+    while True:
+        _dirty.wait()
+        time.sleep(SAVE_DELAY)
+        _dirty.clear()
+        _flush()
+
+
+@atexit.register
+def _flush():
+    """Write any changes not yet on disk; also runs at exit, so a pending write is not lost."""
+    with _lock:
+        snapshot = _snapshot()
+    _save(snapshot)
+
+
+def _write_atomic(name: str, data: bytes):
+    """Write a cache file through a temporary file and os.replace, so a crash never leaves it partial."""
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(CACHE_DIR, name))
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _save(snapshot: tuple):
+    """
+    Persist a _snapshot outside _lock; failures leave the in-memory cache intact.
+    
+    Embeddings and their row metadata share one file, so they can never be
+    replaced out of step with each other.
+    """
+    global _saved_generation
+    generation, exact, vectors, vector_entries = snapshot
+    with _save_lock:
+        if generation <= _saved_generation:
+            # A newer snapshot has already been written
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            _write_atomic("responses.json", json.dumps(exact).encode("utf-8"))
+            if vectors is not None:
+                buf = io.BytesIO()
+                np.savez(buf, vectors=vectors, entries=np.array(json.dumps(vector_entries)))
+                _write_atomic("semantic.npz", buf.getvalue())
+        except OSError:
+            return
+        _saved_generation = generation
+
+
+def _generate_with_backoff(model, prompt: Any, **kwargs):
+    """
+    Call model.generate_content, retrying transient quota/availability errors.
+    
+    With stream=True the first chunk is fetched inside generate_content, so a
+    rejected request is retried before any text reaches the caller.
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return model.generate_content(prompt, **kwargs)
+        except (ResourceExhausted, ServiceUnavailable):
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+            time.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+
+def _embed(text: str) -> Optional[np.ndarray]:
+    """Embed text as a unit vector, or None if the embedding call fails."""
+    try:
+        result = genai.embed_content(model=EMBEDDING_MODEL, content=text)
+    except Exception:
+        return None
+    vector = np.asarray(result["embedding"], dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def _semantic_lookup(embedding: np.ndarray, tag: str, scope: str, ttl: Optional[int]) -> Optional[str]:
+    """Return the cached text of the most similar fresh entry above the threshold."""
+    if _vectors is None or _vectors.shape[1] != embedding.shape[0]:
+        return None
+    similarities = _vectors @ embedding
+    for row in np.argsort(similarities)[::-1]:
+        if similarities[row] < SIMILARITY_THRESHOLD:
+            break
+        meta = _vector_entries[row]
+        entry = _exact.get(meta["key"])
+        if meta["tag"] == tag and meta.get("scope") == scope and entry and _is_fresh(entry, ttl):
+            return entry["text"]
+    return None
+
+
+def cached_generate(
+    model,
+    prompt: Any,
+    *,
+    tag: str,
+    ttl: Optional[int] = None,
+    semantic_text: Optional[str] = None,
+    semantic_scope: Optional[str] = None,
+    on_text: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Generate content with Gemini, reusing cached responses where possible.
+
+    Lookups go exact match (prompt hash) -> semantic match -> LLM call.
+    Concurrent calls for the same uncached prompt (e.g. from other sessions)
+    wait for the first one and reuse its response instead of calling the LLM,
+    for up to INFLIGHT_WAIT_TIMEOUT seconds. Models sampling above
+    MAX_CACHEABLE_TEMPERATURE skip the cache and always call the LLM.
+
+    Args:
+        model: Configured genai.GenerativeModel
+        prompt: Prompt passed to generate_content (string or list of parts)
+        tag: Cache namespace, so different tasks never share responses
+        ttl: Maximum age in seconds of a reusable response (None = no expiry)
+        semantic_text: Part of the prompt whose rewording may reuse a response
+            (e.g. the job description); it is embedded for near-duplicate matching
+        semantic_scope: The rest of the prompt's input (e.g. the resume text),
+            which must match exactly, so one user's response is never served
+            for another resume; the semantic tier is skipped unless both are given
+        on_text: Called with each text chunk when the response is streamed
+            from the LLM; cache hits return without calling it
+
+    Returns:
+        Response text
+    """
+    if not _is_cacheable(model):
+        return _generate(model, prompt, on_text)
+
+    key = _prompt_key(model, prompt)
+
+    with _lock:
+        _load()
+        entry = _exact.get(key)
+        if entry and _is_fresh(entry, ttl):
+            return entry["text"]
+        pending = _inflight.get(key)
+        if pending is None:
+            _inflight[key] = threading.Event()
+
+    if pending is not None:
+        # Retry once the in-flight call finishes; if it failed, this call generates.
+        # A call that never finishes must not block this one, so fall back to the LLM.
+        if not pending.wait(INFLIGHT_WAIT_TIMEOUT):
+            return _generate_and_store(model, prompt, key, tag, ttl, semantic_text, semantic_scope, on_text)
+        return cached_generate(
+            model, prompt, tag=tag, ttl=ttl, semantic_text=semantic_text,
+            semantic_scope=semantic_scope, on_text=on_text
+        )
+
+    try:
+        return _generate_and_store(model, prompt, key, tag, ttl, semantic_text, semantic_scope, on_text)
+    finally:
+        with _lock:
+            _inflight.pop(key).set()
+
+
+def _generate(model, prompt: Any, on_text: Optional[Callable[[str], None]]) -> str:
+    """Call the LLM, streaming the text to on_text when it is given."""
+    if on_text is None:
+        return _generate_with_backoff(model, prompt).text
+    chunks = []
+    for chunk in _generate_with_backoff(model, prompt, stream=True):
+        chunks.append(chunk.text)
+        on_text(chunk.text)
+    return "".join(chunks)
+
+
+def _generate_and_store(
+    model,
+    prompt: Any,
+    key: str,
+    tag: str,
+    ttl: Optional[int],
+    semantic_text: Optional[str],
+    semantic_scope: Optional[str],
+    on_text: Optional[Callable[[str], None]]
+) -> str:
+    """Resolve an exact-cache miss via the semantic tier or the LLM, caching the result."""
+    global _vectors, _vector_entries
+    embedding = None
+    if semantic_text and semantic_scope:
+        scope = hashlib.sha256(semantic_scope.encode()).hexdigest()
+        embedding = _embed(semantic_text)
+    if embedding is not None:
+        with _lock:
+            text = _semantic_lookup(embedding, tag, scope, ttl)
+        if text is not None:
+            return text
+
+    text = _generate(model, prompt, on_text)
+
+    with _lock:
+        _store(key, {"tag": tag, "created": time.time(), "text": text})
+        if embedding is not None:
+            row = embedding[np.newaxis, :]
+            _vectors = row if _vectors is None else np.vstack([_vectors, row])
+            _vector_entries.append({"tag": tag, "scope": scope, "created": time.time(), "key": key})
+            if len(_vector_entries) > MAX_SEMANTIC_ENTRIES:
+                _vectors = _vectors[-MAX_SEMANTIC_ENTRIES:]
+                _vector_entries = _vector_entries[-MAX_SEMANTIC_ENTRIES:]
+        _schedule_save()
+
+    return text
+
+
+def cached_generate_many(
+    model,
+    prompts: List[Any],
+    *,
+    tag: str,
+    ttl: Optional[int] = None
+) -> List[str]:
+    """
+    Generate content for several prompts, issuing the uncached ones concurrently.
+
+    Only the exact tier is consulted; embedding every prompt first would
+    serialize the round trips that running them in parallel is meant to save.
+    Models sampling above MAX_CACHEABLE_TEMPERATURE skip the cache entirely.
+
+    Args:
+        model: Configured genai.GenerativeModel
+        prompts: Prompts passed to generate_content
+        tag: Cache namespace, so different tasks never share responses
+        ttl: Maximum age in seconds of a reusable response (None = no expiry)
+
+    Returns:
+        Response texts in the same order as prompts
+    """
+    if not _is_cacheable(model):
+        with ThreadPoolExecutor(max_workers=max(len(prompts), 1)) as pool:
+            return list(pool.map(lambda prompt: _generate_with_backoff(model, prompt).text, prompts))
+
+    keys = [_prompt_key(model, prompt) for prompt in prompts]
+    texts = [None] * len(prompts)
+
+    with _lock:
+        _load()
+        for i, key in enumerate(keys):
+            entry = _exact.get(key)
+            if entry and _is_fresh(entry, ttl):
+                texts[i] = entry["text"]
+
+    pending = [i for i, text in enumerate(texts) if text is None]
+    if not pending:
+        return texts
+
+    with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+        responses = list(pool.map(lambda i: _generate_with_backoff(model, prompts[i]).text, pending))
+
+    with _lock:
+        for i, text in zip(pending, responses):
+            texts[i] = text
+            _store(keys[i], {"tag": tag, "created": time.time(), "text": text})
+        _schedule_save()
+
+    return texts
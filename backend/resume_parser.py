@@ -4,12 +4,17 @@ Extracts and structures information from resume documents.
 """
 
 import streamlit as st
-import google.generativeai as genai
+from streamlit.runtime.uploaded_file_manager import UploadedFile
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from itertools import chain
 import re
 import json
 
+from gemini_client import ANALYSIS_TEMPERATURE, get_gemini_model
+from llm_cache import cached_generate
+from utils import uploaded_file_cache_key, JsonFieldScanner
+
 
 class Education(BaseModel):
     """Education entry in resume."""
@@ -45,19 +50,26 @@ class ParsedResume(BaseModel):
     certifications: List[str] = Field(description="Certifications and courses")
     projects: List[str] = Field(description="Notable projects")
 
+    @property
+    def lower_skill_names(self) -> frozenset:
+        """Lowercased skill names (computed on access, so copies and equality stay field-based)."""
+        return frozenset(skill.name.lower() for skill in self.skills)
 
-def get_gemini_model(model_name="models/gemini-2.5-flash"):
-    """Configure Gemini model to return JSON output."""
-    generation_config = genai.GenerationConfig(
-        response_mime_type="application/json"
-    )
-    return genai.GenerativeModel(
-        model_name=model_name,
-        generation_config=generation_config
-    )
+
+# JSON shape of ParsedResume for the parsing prompt
+RESUME_JSON_SCHEMA = """{
+    "name": string|null,
+    "email": string|null,
+    "phone": string|null,
+    "summary": string|null,
+    "skills": [{"name": string, "category": "technical"|"tool"|"soft_skill"}],
+    "education": [{"degree": string|null, "institution": string|null, "graduation_year": string|null, "gpa": string|null}],
+    "experience": [{"title": string|null, "company": string|null, "duration": string|null, "description": string|null}],
+    "certifications": [string],
+    "projects": [string]
+}"""
 
 
-@st.cache_data(show_spinner="📄 Parsing resume...")
 def parse_resume_from_file(uploaded_file):
     """
     Parse resume from uploaded file using Gemini API.
@@ -72,92 +84,82 @@ def parse_resume_from_file(uploaded_file):
         return None
     
     try:
-        bytes_data = uploaded_file.getvalue()
-        resume_file_part = {
-            "mime_type": uploaded_file.type,
-            "data": bytes_data
-        }
-        
-        prompt = [
-            """You are an expert resume parser. Analyze the provided resume document and extract:
-1. Name, email, phone
-2. Professional summary
-3. Skills (categorize as: technical, tool, or soft_skill)
-4. Education (degree, institution, graduation year, GPA if available)
-5. Work experience (title, company, duration, description)
-6. Certifications and courses
-7. Notable projects
-
-Return ONLY valid JSON matching this schema (no markdown, no explanations):
-{
-    "name": string|null,
-    "email": string|null,
-    "phone": string|null,
-    "summary": string|null,
-    "skills": [{"name": string, "category": "technical"|"tool"|"soft_skill"}],
-    "education": [{"degree": string|null, "institution": string|null, "graduation_year": string|null, "gpa": string|null}],
-    "experience": [{"title": string|null, "company": string|null, "duration": string|null, "description": string|null}],
-    "certifications": [string],
-    "projects": [string]
-}
-If any field is not present, use null.
-For skills, ensure each skill has a category.
-Do not include triple backticks or any extra text.""",
-            resume_file_part
-        ]
-        
-        model = get_gemini_model()
-        response = model.generate_content(prompt)
-        
-        parsed = ParsedResume.model_validate_json(response.text)
-        return parsed
-        
+        return _parse_resume_from_file_cached(uploaded_file)
     except Exception as e:
         st.error(f"Error parsing resume: {str(e)}")
         return None
 
 
-def extract_keywords_from_resume(resume: ParsedResume) -> set:
-    """Extract all relevant keywords from parsed resume."""
-    keywords = set()
+@st.cache_data(
+    show_spinner="📄 Parsing resume...",
+    persist="disk",
+    max_entries=500,
+    hash_funcs={UploadedFile: uploaded_file_cache_key}
+)
+def _parse_resume_from_file_cached(uploaded_file) -> ParsedResume:
+    """
+    Cached worker for parse_resume_from_file.
     
-    if resume.summary:
-        keywords.update(extract_keywords_from_text(resume.summary))
+    Errors propagate instead of returning None, so st.cache_data never
+    persists a failed parse.
+    """
+    bytes_data = uploaded_file.getvalue()
+    resume_file_part = {
+        "mime_type": uploaded_file.type,
+        "data": bytes_data
+    }
     
-    for skill in resume.skills:
-        keywords.add(skill.name.lower())
+    prompt = [
+        "You are an expert resume parser. Extract the attached resume as JSON matching this schema, "
+        "using null for missing fields:\n" + RESUME_JSON_SCHEMA,
+        resume_file_part
+    ]
     
-    for exp in resume.experience:
-        if exp.description:
-            keywords.update(extract_keywords_from_text(exp.description))
+    # List resume sections as they stream in; the placeholder is created
+    # here so cache hits replay it cleanly.
+    scanner = JsonFieldScanner()
+    preview = st.empty()
+    received = []
+
+    def show_progress(chunk: str):
+        received.extend(key.replace('_', ' ') for key, _ in scanner.feed(chunk))
+        preview.caption(f"📄 Read {', '.join(received)}...")
+
+    model = get_gemini_model(temperature=ANALYSIS_TEMPERATURE)
+    response_text = cached_generate(model, prompt, tag="resume_parse", on_text=show_progress)
+    preview.empty()
     
+    parsed = ParsedResume.model_validate_json(response_text)
+    return parsed
+
+
+def extract_keywords_from_resume(resume: ParsedResume) -> set:
+    """Extract all relevant keywords from parsed resume."""
+    # One regex scan over all free text instead of one scan (and set) per section
+    texts = chain([resume.summary], (exp.description for exp in resume.experience))
+    keywords = extract_keywords_from_text("\n".join(text for text in texts if text))
+    keywords |= resume.lower_skill_names
     return keywords
 
 
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'up', 'is', 'are', 'was', 'were', 'be',
+    'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that',
+    'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+})
+
+# Words of 3+ chars; keeps tech spellings like c++, node.js, ci/cd but not trailing punctuation
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#./\-]+[a-z0-9+#]")
+
+
 def extract_keywords_from_text(text: str) -> set:
     """Extract keywords from text using simple NLP."""
     if not text:
         return set()
     
-    # Convert to lowercase and split
-    words = text.lower().split()
-    
-    # Filter out common stopwords and short words
-    stopwords = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'up', 'is', 'are', 'was', 'were', 'be',
-        'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-        'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that',
-        'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
-    }
-    
-    keywords = {
-        word.strip('.,;:!?\"\'') 
-        for word in words 
-        if len(word.strip('.,;:!?\"\'')) > 2 and word.lower() not in stopwords
-    }
-    
-    return keywords
+    return set(_TOKEN_RE.findall(text.lower())) - STOPWORDS
 
 
 def detect_missing_sections(resume: ParsedResume) -> dict:
@@ -0,0 +1,104 @@
+"""
+Resume Pipeline Module
+Job-matches and reviews a parsed resume in a single Gemini request.
+"""
+
+import streamlit as st
+from pydantic import BaseModel, Field
+from typing import Optional
+import json
+
+from gemini_client import ANALYSIS_TEMPERATURE, get_gemini_model
+from llm_cache import cached_generate
+from job_matcher import JobMatchResult, MATCH_JSON_KEYS
+from resume_rewriter import ResumeFeedback, FEEDBACK_JSON_KEYS, format_resume_for_analysis
+from utils import (
+    resume_cache_key,
+    job_description_cache_key,
+    build_resume_job_prompt,
+    JsonFieldScanner
+)
+
+
+class JobAnalysis(BaseModel):
+    """Combined result of job matching and improvement suggestions."""
+    match: JobMatchResult = Field(description="Fit against the job description")
+    feedback: ResumeFeedback = Field(description="Improvement suggestions for the job")
+
+
+JOB_ANALYSIS_INSTRUCTIONS = f"""You are an expert career advisor and resume coach. Using the resume and job description above, return ONE JSON object with exactly these keys:
+
+"match": a realistic, constructive assessment of how well the resume fits the job, with keys: {MATCH_JSON_KEYS}
+
+"feedback": 3-5 specific suggestions to improve the resume for this job (stronger action verbs, quantified results, job keywords, clarity, ATS-friendly formatting), with keys: {FEEDBACK_JSON_KEYS}
+
+Return only the JSON object."""
+
+
+def analyze_job_pipeline(resume_dict: dict, job_description: str) -> Optional[JobAnalysis]:
+    """
+    Match an already parsed resume to a job and suggest improvements in one call.
+
+    Serves both the suggestions and job matching pages from a single Gemini
+    round trip, so visiting the second page for the same job is free.
+
+    Args:
+        resume_dict: Parsed resume dictionary
+        job_description: Target job description text
+
+    Returns:
+        JobAnalysis object or None if analysis fails
+    """
+    try:
+        return _analyze_job_pipeline_cached(resume_dict, job_description)
+    except Exception as e:
+        st.error(f"Error analyzing resume: {str(e)}")
+        return None
+
+
+@st.cache_data(show_spinner="🚀 Analyzing resume against the job...", persist="disk", max_entries=500)
+def _analyze_job_pipeline_cached(resume_dict: dict, job_description: str) -> JobAnalysis:
+    """Cached worker for analyze_job_pipeline; errors propagate so failures are never persisted."""
+    resume_text = format_resume_for_analysis(resume_dict)
+    prompt = build_resume_job_prompt(resume_text, job_description, JOB_ANALYSIS_INSTRUCTIONS)
+
+    # Show the match score as soon as the match section streams in; the
+    # placeholder is created here so cache hits replay it cleanly.
+    scanner = JsonFieldScanner()
+    preview = st.empty()
+
+    def show_progress(chunk: str):
+        # Preview only: an unexpected match value is skipped, never allowed to fail the call
+        for key, raw_value in scanner.feed(chunk):
+            if key != 'match':
+                continue
+            try:
+                match = json.loads(raw_value)
+            except ValueError:
+                continue
+            if isinstance(match, dict) and 'match_percentage' in match:
+                preview.info(f"🎯 Match score: {match['match_percentage']}% (writing suggestions...)")
+
+    model = get_gemini_model(temperature=ANALYSIS_TEMPERATURE)
+    response_text = cached_generate(
+        model, prompt, tag="job_pipeline", semantic_text=job_description, semantic_scope=resume_text,
+        on_text=show_progress
+    )
+    preview.empty()
+
+    return JobAnalysis.model_validate_json(response_text)
+
+
+def store_pipeline_result(analysis: JobAnalysis, job_description: str, resume_dict: dict) -> None:
+    """Remember a pipeline result for the session so single-task pages can reuse it."""
+    results = st.session_state.setdefault("pipeline_results", {})
+    key = (resume_cache_key(resume_dict), job_description_cache_key(job_description))
+    results[key] = analysis
+
+
+def get_pipeline_result(resume_dict: dict, job_description: str) -> Optional[JobAnalysis]:
+    """Return the session's pipeline result for this resume and job, if any."""
+    results = st.session_state.get("pipeline_results")
+    if not results:
+        return None
+    return results.get((resume_cache_key(resume_dict), job_description_cache_key(job_description)))
@@ -4,9 +4,9 @@ Generates AI-powered suggestions to improve resume content.
 """
 
 import streamlit as st
-import google.generativeai as genai
 from pydantic import BaseModel, Field
 from typing import List, Optional
+import re
 
 
 class ResumeSuggestion(BaseModel):
@@ -31,126 +31,72 @@ class ActionVerbSuggestion(BaseModel):
     revised_bullet: str
 
 
-def get_gemini_model():
-    """Configure Gemini model to return JSON output."""
-    generation_config = genai.GenerationConfig(
-        response_mime_type="application/json",
-        temperature=0.7
-    )
-    return genai.GenerativeModel(
-        model_name="models/gemini-2.5-flash",
-        generation_config=generation_config
-    )
-
-
-@st.cache_data(show_spinner="💡 Generating improvement suggestions...")
-def generate_resume_suggestions(
-    parsed_resume_dict: dict,
-    job_description: str
-) -> ResumeFeedback:
-    """
-    Generate AI-powered resume improvement suggestions.
-    
-    Args:
-        parsed_resume_dict: Dictionary of parsed resume data
-        job_description: Target job description
-    
-    Returns:
-        ResumeFeedback object with suggestions
-    """
-    try:
-        # Prepare resume text
-        resume_text = format_resume_for_analysis(parsed_resume_dict)
-        
-        prompt = f"""You are an expert career coach and resume specialist. Analyze this resume against the job description and provide specific, actionable improvement suggestions.
-
-RESUME:
-{resume_text}
-
-JOB DESCRIPTION:
-{job_description}
-
-Provide 3-5 specific suggestions to improve the resume for this job role. Focus on:
-1. Using stronger action verbs
-2. Adding quantifiable metrics and results
-3. Incorporating relevant keywords from the job description
-4. Improving clarity and professional language
-5. ATS-friendly formatting
-
-For each suggestion, provide the original text, improved version, and reason."""
-
-        # Enforce clean JSON output to avoid markdown fences
-        prompt += "\n\nReturn only valid JSON with keys: overall_assessment (string), suggestions (list of {original_text, suggested_text, reason, focus_area}), top_actions (list of strings). No extra text or markdown."
+# JSON shape of ResumeFeedback, shared with the combined resume pipeline prompt
+FEEDBACK_JSON_KEYS = (
+    "overall_assessment (string), suggestions (list of {original_text, suggested_text, "
+    "reason, focus_area}), top_actions (list of strings)"
+)
 
-        model = get_gemini_model()
-        response = model.generate_content(prompt)
 
-        feedback = ResumeFeedback.model_validate_json(response.text)
-        return feedback
-        
-    except Exception as e:
-        st.error(f"Error generating suggestions: {str(e)}")
-        return None
-
-
-def format_resume_for_analysis(resume_dict: dict) -> str:
-    """Format parsed resume dictionary into readable text."""
-    text_parts = []
-    
+def _iter_analysis_lines(resume_dict: dict):
+    """Yield the readable text lines of a parsed resume dictionary."""
     if resume_dict.get('name'):
-        text_parts.append(f"Name: {resume_dict['name']}")
+        yield f"Name: {resume_dict['name']}"
     
     if resume_dict.get('email'):
-        text_parts.append(f"Email: {resume_dict['email']}")
+        yield f"Email: {resume_dict['email']}"
     
     if resume_dict.get('phone'):
-        text_parts.append(f"Phone: {resume_dict['phone']}")
+        yield f"Phone: {resume_dict['phone']}"
     
     if resume_dict.get('summary'):
-        text_parts.append(f"\nProfessional Summary:\n{resume_dict['summary']}")
+        yield f"\nProfessional Summary:\n{resume_dict['summary']}"
     
     if resume_dict.get('experience'):
-        text_parts.append("\nExperience:")
+        yield "\nExperience:"
         for exp in resume_dict['experience']:
             if isinstance(exp, dict):
-                text_parts.append(
+                yield (
                     f"- {exp.get('title', 'Unknown')} at {exp.get('company', 'Unknown')} "
                     f"({exp.get('duration', 'Unknown')})\n"
                     f"  {exp.get('description', '')}"
                 )
     
     if resume_dict.get('skills'):
-        text_parts.append("\nSkills:")
+        yield "\nSkills:"
         skills = resume_dict['skills']
         if isinstance(skills, list):
             if skills and isinstance(skills[0], dict):
                 for skill in skills:
-                    text_parts.append(f"- {skill.get('name', skill)}")
+                    yield f"- {skill.get('name', skill)}"
             else:
                 for skill in skills:
-                    text_parts.append(f"- {skill}")
+                    yield f"- {skill}"
     
     if resume_dict.get('education'):
-        text_parts.append("\nEducation:")
+        yield "\nEducation:"
         for edu in resume_dict['education']:
             if isinstance(edu, dict):
-                text_parts.append(
+                yield (
                     f"- {edu.get('degree', 'Unknown')} from "
                     f"{edu.get('institution', 'Unknown')} "
                     f"({edu.get('graduation_year', 'Unknown')})"
                 )
     
     if resume_dict.get('certifications'):
-        text_parts.append("\nCertifications:")
+        yield "\nCertifications:"
         for cert in resume_dict['certifications']:
-            text_parts.append(f"- {cert}")
+            yield f"- {cert}"
     
     if resume_dict.get('projects'):
-        text_parts.append("\nProjects:")
+        yield "\nProjects:"
         for project in resume_dict['projects']:
-            text_parts.append(f"- {project}")
-    
-    return "\n".join(text_parts)
+            yield f"- {project}"
+
+
+def format_resume_for_analysis(resume_dict: dict) -> str:
+    """Format parsed resume dictionary into readable text."""
+    return "\n".join(_iter_analysis_lines(resume_dict))
 
 
 # Action verbs for different industries
@@ -174,21 +120,25 @@ ACTION_VERBS = {
 }
 
 
+# Context keywords (matched as substrings, so "teams" and "codebase" count) that add verb groups
+_VERB_CONTEXT_KEYWORDS = (
+    ('technical', ('code', 'software', 'data', 'algorithm')),
+    ('leadership', ('team', 'people', 'staff', 'group')),
+    ('analytics', ('metric', 'percent', 'number', 'report')),
+)
+
+
 def suggest_action_verbs(bullet_point: str) -> List[str]:
     """Suggest stronger action verbs for a bullet point."""
     weak_verbs = ['was', 'did', 'made', 'helped', 'worked', 'handled', 'dealt']
     
     suggested = ACTION_VERBS['general'].copy()
     
-    # Add context-specific verbs
-    if any(word in bullet_point.lower() for word in ['code', 'software', 'data', 'algorithm']):
-        suggested.extend(ACTION_VERBS['technical'])
-    
-    if any(word in bullet_point.lower() for word in ['team', 'people', 'staff', 'group']):
-        suggested.extend(ACTION_VERBS['leadership'])
-    
-    if any(word in bullet_point.lower() for word in ['metric', 'percent', 'number', 'report']):
-        suggested.extend(ACTION_VERBS['analytics'])
+    # Add context-specific verbs, lowercasing the bullet only once
+    bullet_lower = bullet_point.lower()
+    for category, keywords in _VERB_CONTEXT_KEYWORDS:
+        if any(word in bullet_lower for word in keywords):
+            suggested.extend(ACTION_VERBS[category])
     
     return list(set(suggested))[:5]  # Return top 5 unique suggestions
 
@@ -200,24 +150,21 @@ def identify_quantification_opportunities(bullet_point: str) -> bool:
     return not has_metrics
 
 
+# Wordy phrases and their concise replacements
+CLARITY_REPLACEMENTS = {
+    'was able to': 'successfully',
+    'in order to': 'to',
+    'at the end of the day': 'ultimately',
+    'it is important to note that': '',
+    'the fact that': ''
+}
+_CLARITY_RE = re.compile('|'.join(re.escape(wordy) for wordy in CLARITY_REPLACEMENTS))
+
+
 def improve_clarity(text: str) -> str:
     """Basic text clarity improvements."""
-    # Remove passive voice indicators
-    improvements = text
-    
-    # Replace wordy phrases with concise ones
-    replacements = {
-        'was able to': 'successfully',
-        'in order to': 'to',
-        'at the end of the day': 'ultimately',
-        'it is important to note that': '',
-        'the fact that': ''
-    }
-    
-    for wordy, concise in replacements.items():
-        improvements = improvements.replace(wordy, concise)
-    
-    return improvements.strip()
+    # Replace wordy phrases with concise ones in a single pass
+    return _CLARITY_RE.sub(lambda m: CLARITY_REPLACEMENTS[m.group(0)], text).strip()
 
 
 @st.cache_data(show_spinner="✍️ Analyzing bullet points...")
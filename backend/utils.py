@@ -3,14 +3,19 @@ Utility Functions
 Common utilities for the resume analysis system.
 """
 
+import hashlib
 import json
 import os
+import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from bisect import bisect_right
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def load_skill_database() -> Dict[str, List[str]]:
-    """Load skill categories database."""
+    """Load skill categories database (built once and shared; do not mutate)."""
     return {
         'programming_languages': [
             'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Go', 'Rust',
@@ -44,6 +49,18 @@ def load_skill_database() -> Dict[str, List[str]]:
     }
 
 
+def _build_skill_index() -> Dict[str, str]:
+    """Map each lowercased skill to its category (first category wins on duplicates)."""
+    index = {}
+    for category, skills_list in load_skill_database().items():
+        for skill in skills_list:
+            index.setdefault(skill.lower(), category)
+    return index
+
+
+_SKILL_TO_CATEGORY = _build_skill_index()
+
+
 def categorize_skill(skill_name: str) -> str:
     """
     Categorize a skill into a category.
@@ -52,14 +69,37 @@ def categorize_skill(skill_name: str) -> str:
         One of: 'programming_languages', 'web_frameworks', 'databases',
                 'cloud_platforms', 'devops_tools', 'data_science', 'soft_skills', 'other'
     """
-    skill_lower = skill_name.lower()
-    skills_db = load_skill_database()
-    
-    for category, skills_list in skills_db.items():
-        if any(skill.lower() == skill_lower for skill in skills_list):
-            return category
+    return _SKILL_TO_CATEGORY.get(skill_name.lower(), 'other')
+
+
+def trie_pattern(words) -> str:
+    """
+    Build a prefix-factored regex alternation for a set of words.
     
-    return 'other'
+    Shared prefixes are matched once, so the regex engine follows a single
+    trie path per position instead of retrying every word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+# Non-capturing century group, so findall returns whole four-digit years
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
 
 
 def calculate_experience_years(duration: str) -> Optional[int]:
@@ -76,8 +116,7 @@ def calculate_experience_years(duration: str) -> Optional[int]:
         current_year = datetime.now().year
         
         # Extract years from string
-        import re
-        years = re.findall(r'\b(19|20)\d{2}\b', duration)
+        years = _YEAR_RE.findall(duration)
         
         if len(years) >= 1:
             start_year = int(years[0])
@@ -95,24 +134,59 @@ def calculate_experience_years(duration: str) -> Optional[int]:
     return None
 
 
+_TITLE_WORD_RE = re.compile(r'[a-z]+')
+
+
+@lru_cache(maxsize=128)
+def title_tokens(job_title: str) -> frozenset:
+    """Lowercase and split a job title into a set of words."""
+    return frozenset(_TITLE_WORD_RE.findall(job_title.lower()))
+
+
+# Whole title words, so "SRE" is not senior and "Internal Tools" is not an internship
+# Plural and derived forms keep every title the original substring checks caught
+_LEAD_TITLE_WORDS = frozenset({
+    'lead', 'leads', 'leader', 'leaders', 'leadership', 'principal', 'principals',
+    'architect', 'architects', 'director', 'directors', 'vp', 'vps', 'svp', 'avp', 'evp'
+})
+_SENIOR_TITLE_WORDS = frozenset({'senior', 'seniors', 'sr', 'staff'})
+_ENTRY_TITLE_WORDS = frozenset({
+    'junior', 'juniors', 'jr', 'associate', 'associates', 'intern', 'interns', 'internship', 'internships'
+})
+
+
 def estimate_seniority_level(experience_years: Optional[int], job_title: str) -> str:
     """
     Estimate seniority level based on experience and title.
     
     Returns:
         One of: 'entry-level', 'mid-level', 'senior', 'lead'
+    
+    Examples:
+        >>> estimate_seniority_level(8, "SVP, Engineering")
+        'lead'
+        >>> estimate_seniority_level(8, "Directors of Product")
+        'lead'
+        >>> estimate_seniority_level(0, "Software Engineering Internship")
+        'entry-level'
+        >>> estimate_seniority_level(6, "Interns Program Coordinator")
+        'entry-level'
+        >>> estimate_seniority_level(1, "SRE")
+        'entry-level'
+        >>> estimate_seniority_level(3, "Internal Tools Developer")
+        'mid-level'
     """
     if experience_years is None:
         experience_years = 0
     
-    job_title_lower = job_title.lower()
+    tokens = title_tokens(job_title)
     
     # Check title indicators
-    if any(word in job_title_lower for word in ['lead', 'principal', 'architect', 'director', 'vp']):
+    if tokens & _LEAD_TITLE_WORDS:
         return 'lead'
-    elif any(word in job_title_lower for word in ['senior', 'sr', 'staff']):
+    elif tokens & _SENIOR_TITLE_WORDS:
         return 'senior'
-    elif any(word in job_title_lower for word in ['junior', 'jr', 'associate', 'intern']):
+    elif tokens & _ENTRY_TITLE_WORDS:
         return 'entry-level'
     
     # Check experience years
@@ -124,6 +198,22 @@ def estimate_seniority_level(experience_years: Optional[int], job_title: str) ->
         return 'entry-level'
 
 
+# Lower bounds of the Fair/Partial, Good and Excellent/Perfect display bands
+_SCORE_BAND_THRESHOLDS = (40, 60, 80)
+_ATS_SCORE_BANDS = (
+    ('🔴', 'red', 'Needs Improvement'),
+    ('🟠', 'orange', 'Fair'),
+    ('🟡', 'orange', 'Good'),
+    ('🟢', 'green', 'Excellent'),
+)
+_MATCH_BANDS = (
+    ('🔴', 'Poor Match'),
+    ('🟠', 'Partial Match'),
+    ('🟡', 'Good Match'),
+    ('🟢', 'Perfect Match'),
+)
+
+
 def format_ats_score_display(score: int) -> tuple:
     """
     Format ATS score for display with emoji and color-coding.
@@ -131,76 +221,75 @@ def format_ats_score_display(score: int) -> tuple:
     Returns:
         (emoji, color, assessment)
     """
-    if score >= 80:
-        return '🟢', 'green', 'Excellent'
-    elif score >= 60:
-        return '🟡', 'orange', 'Good'
-    elif score >= 40:
-        return '🟠', 'orange', 'Fair'
-    else:
-        return '🔴', 'red', 'Needs Improvement'
+    return _ATS_SCORE_BANDS[bisect_right(_SCORE_BAND_THRESHOLDS, score)]
 
 
 def format_match_percentage(percentage: int) -> tuple:
     """Format match percentage with emoji and assessment."""
-    if percentage >= 80:
-        return '🟢', 'Perfect Match'
-    elif percentage >= 60:
-        return '🟡', 'Good Match'
-    elif percentage >= 40:
-        return '🟠', 'Partial Match'
-    else:
-        return '🔴', 'Poor Match'
+    return _MATCH_BANDS[bisect_right(_SCORE_BAND_THRESHOLDS, percentage)]
 
 
-def resume_dict_to_text(resume_dict: Dict[str, Any]) -> str:
-    """Convert resume dictionary to readable text format."""
-    lines = []
+_SECTION_RULE = "-" * 40
+_NAME_BORDER = "=" * 60
+# Lines around the name header (border preceded / followed by a blank line)
+_NAME_BORDER_TOP = f"\n{_NAME_BORDER}"
+_NAME_BORDER_BOTTOM = f"{_NAME_BORDER}\n"
+
+
+def _iter_resume_text_lines(resume_dict: Dict[str, Any]):
+    """Yield the readable text lines of a resume dictionary."""
+    get = resume_dict.get
     
     # Header
-    if resume_dict.get('name'):
-        lines.append(f"\n{'=' * 60}")
-        lines.append(f"{resume_dict['name'].upper()}")
-        lines.append(f"{'=' * 60}\n")
+    name = get('name')
+    if name:
+        yield _NAME_BORDER_TOP
+        yield name.upper()
+        yield _NAME_BORDER_BOTTOM
     
     # Contact
     contact = []
-    if resume_dict.get('email'):
-        contact.append(f"📧 {resume_dict['email']}")
-    if resume_dict.get('phone'):
-        contact.append(f"📱 {resume_dict['phone']}")
+    email = get('email')
+    if email:
+        contact.append(f"📧 {email}")
+    phone = get('phone')
+    if phone:
+        contact.append(f"📱 {phone}")
     if contact:
-        lines.append(" | ".join(contact) + "\n")
+        yield " | ".join(contact) + "\n"
     
     # Summary
-    if resume_dict.get('summary'):
-        lines.append("PROFESSIONAL SUMMARY")
-        lines.append("-" * 40)
-        lines.append(f"{resume_dict['summary']}\n")
+    summary = get('summary')
+    if summary:
+        yield "PROFESSIONAL SUMMARY"
+        yield _SECTION_RULE
+        yield f"{summary}\n"
     
     # Experience
-    if resume_dict.get('experience'):
-        lines.append("PROFESSIONAL EXPERIENCE")
-        lines.append("-" * 40)
-        for exp in resume_dict['experience']:
+    experience = get('experience')
+    if experience:
+        yield "PROFESSIONAL EXPERIENCE"
+        yield _SECTION_RULE
+        for exp in experience:
             if isinstance(exp, dict):
                 title = exp.get('title', 'Unknown')
                 company = exp.get('company', 'Unknown')
                 duration = exp.get('duration', '')
                 desc = exp.get('description', '')
                 
-                lines.append(f"{title} | {company}")
+                yield f"{title} | {company}"
                 if duration:
-                    lines.append(f"{duration}")
+                    yield f"{duration}"
                 if desc:
-                    lines.append(f"{desc}")
-                lines.append("")
+                    yield f"{desc}"
+                yield ""
     
     # Education
-    if resume_dict.get('education'):
-        lines.append("\nEDUCATION")
-        lines.append("-" * 40)
-        for edu in resume_dict['education']:
+    education = get('education')
+    if education:
+        yield "\nEDUCATION"
+        yield _SECTION_RULE
+        for edu in education:
             if isinstance(edu, dict):
                 degree = edu.get('degree', '')
                 institution = edu.get('institution', '')
@@ -212,41 +301,46 @@ def resume_dict_to_text(resume_dict: Dict[str, Any]) -> str:
                     edu_line += f" ({year})"
                 if gpa:
                     edu_line += f" - GPA: {gpa}"
-                lines.append(edu_line)
-        lines.append("")
+                yield edu_line
+        yield ""
     
     # Skills
-    if resume_dict.get('skills'):
-        lines.append("\nSKILLS")
-        lines.append("-" * 40)
-        skills = resume_dict['skills']
+    skills = get('skills')
+    if skills:
+        yield "\nSKILLS"
+        yield _SECTION_RULE
         if isinstance(skills, list) and skills:
             if isinstance(skills[0], dict):
                 for skill in skills:
                     category = skill.get('category', 'General')
-                    name = skill.get('name', skill)
-                    lines.append(f"• {name} ({category})")
+                    skill_name = skill.get('name', skill)
+                    yield f"• {skill_name} ({category})"
             else:
-                lines.append(", ".join(str(s) for s in skills))
-        lines.append("")
+                yield ", ".join(str(s) for s in skills)
+        yield ""
     
     # Certifications
-    if resume_dict.get('certifications'):
-        lines.append("\nCERTIFICATIONS")
-        lines.append("-" * 40)
-        for cert in resume_dict['certifications']:
-            lines.append(f"✓ {cert}")
-        lines.append("")
+    certifications = get('certifications')
+    if certifications:
+        yield "\nCERTIFICATIONS"
+        yield _SECTION_RULE
+        for cert in certifications:
+            yield f"✓ {cert}"
+        yield ""
     
     # Projects
-    if resume_dict.get('projects'):
-        lines.append("\nPROJECTS")
-        lines.append("-" * 40)
-        for project in resume_dict['projects']:
-            lines.append(f"• {project}")
-        lines.append("")
-    
-    return "\n".join(lines)
+    projects = get('projects')
+    if projects:
+        yield "\nPROJECTS"
+        yield _SECTION_RULE
+        for project in projects:
+            yield f"• {project}"
+        yield ""
+
+
+def resume_dict_to_text(resume_dict: Dict[str, Any]) -> str:
+    """Convert resume dictionary to readable text format."""
+    return "\n".join(_iter_resume_text_lines(resume_dict))
 
 
 def create_comparison_table(results: List[Dict[str, Any]]) -> str:
@@ -255,22 +349,20 @@ def create_comparison_table(results: List[Dict[str, Any]]) -> str:
         return "No results to compare"
     
     # Simple text-based table
-    lines = []
-    lines.append("\n" + "=" * 100)
-    lines.append(f"{'Name':<25} {'Score':<10} {'Skills Match':<15} {'Fit':<20}")
-    lines.append("=" * 100)
-    
-    for result in results:
-        name = result.get('name', 'Unknown')[:25]
-        score = str(result.get('match_score', 0))
-        skills = str(result.get('skill_match', 0)) + "%"
-        fit = result.get('summary', 'N/A')[:20]
-        
-        lines.append(f"{name:<25} {score:<10} {skills:<15} {fit:<20}")
-    
-    lines.append("=" * 100)
-    
-    return "\n".join(lines)
+    border = "=" * 100
+    rows = "\n".join(
+        f"{result.get('name', 'Unknown')[:25]:<25} "
+        f"{str(result.get('match_score', 0)):<10} "
+        f"{str(result.get('skill_match', 0)) + '%':<15} "
+        f"{result.get('summary', 'N/A')[:20]:<20}"
+        for result in results
+    )
+    header = f"{'Name':<25} {'Score':<10} {'Skills Match':<15} {'Fit':<20}"
+    
+    return f"\n{border}\n{header}\n{border}\n{rows}\n{border}"
+
+
+REQUIRED_RESUME_FIELDS = ('name', 'email', 'phone', 'experience', 'education', 'skills')
 
 
 def validate_resume_data(resume_dict: Dict[str, Any]) -> tuple:
@@ -280,31 +372,36 @@ def validate_resume_data(resume_dict: Dict[str, Any]) -> tuple:
     Returns:
         (is_valid, missing_fields, score)
     """
-    required_fields = {
-        'name': False,
-        'email': False,
-        'phone': False,
-        'experience': False,
-        'education': False,
-        'skills': False
-    }
-    
-    completeness_score = 0
-    
-    for field in required_fields:
-        if resume_dict.get(field):
-            data = resume_dict[field]
-            if isinstance(data, (list, str)):
-                if data:
-                    required_fields[field] = True
-                    completeness_score += 15
-    
-    missing = [field for field, present in required_fields.items() if not present]
+    # A field counts only when it is a non-empty string or list
+    present = tuple(
+        isinstance(data, (list, str)) and bool(data)
+        for data in map(resume_dict.get, REQUIRED_RESUME_FIELDS)
+    )
+    completeness_score = 15 * sum(present)
+    missing = [field for field, ok in zip(REQUIRED_RESUME_FIELDS, present) if not ok]
     is_valid = len(missing) <= 2  # Allow up to 2 missing fields
     
     return is_valid, missing, completeness_score
 
 
+# (applies(ats_score, section_completeness, keyword_match), priorities) in display order
+_PRIORITY_RULES = (
+    (lambda ats, sections, keywords: ats < 50, (
+        "1️⃣ Critical: Improve overall ATS compatibility",
+    )),
+    (lambda ats, sections, keywords: sections < 60, (
+        "2️⃣ High: Complete missing resume sections",
+    )),
+    (lambda ats, sections, keywords: keywords < 50, (
+        "3️⃣ High: Add missing job-relevant keywords",
+    )),
+    (lambda ats, sections, keywords: ats >= 70, (
+        "4️⃣ Medium: Quantify achievements with metrics",
+        "5️⃣ Medium: Use stronger action verbs",
+    )),
+)
+
+
 def get_improvement_priority(
     ats_score: int,
     section_completeness: int,
@@ -313,18 +410,9 @@ def get_improvement_priority(
     """Get prioritized list of improvements."""
     priorities = []
     
-    if ats_score < 50:
-        priorities.append("1️⃣ Critical: Improve overall ATS compatibility")
-    
-    if section_completeness < 60:
-        priorities.append("2️⃣ High: Complete missing resume sections")
-    
-    if keyword_match < 50:
-        priorities.append("3️⃣ High: Add missing job-relevant keywords")
-    
-    if ats_score >= 70:
-        priorities.append("4️⃣ Medium: Quantify achievements with metrics")
-        priorities.append("5️⃣ Medium: Use stronger action verbs")
+    for applies, messages in _PRIORITY_RULES:
+        if applies(ats_score, section_completeness, keyword_match):
+            priorities.extend(messages)
     
     if not priorities:
         priorities.append("✅ Your resume is in good shape! Minor refinements can help.")
@@ -344,3 +432,132 @@ def estimate_application_success(ats_score: int, match_percentage: int) -> str:
         return "⚠️ Low - Consider developing some key skills before applying."
     else:
         return "❌ Very Low - This role may require different expertise. Consider alternatives."
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_INLINE_WHITESPACE_RE = re.compile(r'[ \t]+')
+
+
+def compact_prompt_text(text: str) -> str:
+    """
+    Drop layout-only whitespace and doubled lines from pasted text.
+    
+    Pasted job descriptions often carry indentation, blank-line runs and
+    lines pasted twice in a row; none of it is information, but all of it is
+    tokens. A line repeated elsewhere (e.g. "Requirements:" under two roles)
+    is kept, as are line breaks between lines.
+    """
+    lines = []
+    for line in text.splitlines():
+        line = _INLINE_WHITESPACE_RE.sub(' ', line).strip()
+        if line and (not lines or line != lines[-1]):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def build_resume_job_prompt(resume_text: str, job_description: str, instructions: str) -> str:
+    """
+    Build an LLM prompt for a resume and job description.
+    
+    The resume comes first, then the job description, then the task
+    instructions, so every task for the same resume (and every task for the
+    same resume and job) shares a prompt prefix that Gemini can cache. The
+    job description is compacted with compact_prompt_text.
+    
+    Args:
+        resume_text: Formatted resume text
+        job_description: Job description text
+        instructions: Task-specific instructions
+    
+    Returns:
+        Prompt text
+    """
+    job_description = compact_prompt_text(job_description)
+    return f"RESUME:\n{resume_text}\n\nJOB DESCRIPTION:\n{job_description}\n\n{instructions}"
+
+
+def resume_cache_key(resume_dict: Dict[str, Any]) -> str:
+    """Serialize a resume dict independently of key order, for use as a cache key."""
+    return json.dumps(resume_dict, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def job_description_cache_key(job_description: str) -> str:
+    """Collapse whitespace and case so cosmetic job description edits share a cache key."""
+    return _WHITESPACE_RE.sub(' ', job_description).strip().lower()
+
+
+def uploaded_file_cache_key(uploaded_file) -> str:
+    """Hash an uploaded file by its bytes only, ignoring file name and read position."""
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+
+class JsonFieldScanner:
+    """
+    Incrementally scan a streamed JSON object for completed top-level fields.
+    
+    Feed text chunks as they arrive; each call returns (key, raw_json) pairs
+    for top-level values (scalars, strings, arrays and objects) that closed
+    within the new text.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None
+        self._last_string = None
+        self._key = None
+        self._expect_value = False
+        self._value_start = None
+        self._scalar_start = None
+
+    def feed(self, chunk: str) -> list:
+        """Append a chunk and return the top-level fields it completed."""
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._scalar_start is not None:
+                # Numbers, booleans and null end at the next delimiter
+                if ch not in ',}' and not ch.isspace():
+                    continue
+                completed.append((self._key, text[self._scalar_start:i]))
+                self._scalar_start = None
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        raw = text[self._string_start:i + 1]
+                        if self._expect_value:
+                            completed.append((self._key, raw))
+                            self._expect_value = False
+                        else:
+                            self._last_string = json.loads(raw)
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ':' and self._depth == 1:
+                self._key = self._last_string
+                self._expect_value = True
+            elif ch in '[{':
+                if self._depth == 1:
+                    self._value_start = i
+                    self._expect_value = False
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    completed.append((self._key, text[self._value_start:i + 1]))
+                    self._value_start = None
+            elif self._expect_value and self._depth == 1 and not ch.isspace():
+                self._scalar_start = i
+                self._expect_value = False
+        self._pos = len(text)
+        return completed
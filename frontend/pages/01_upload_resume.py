@@ -6,10 +6,13 @@ import streamlit as st
 import sys
 import os
 
-# Add backend to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../backend'))
+# Streamlit re-executes this script on every rerun; add the backend path only once
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '../../backend')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from resume_parser import parse_resume_from_file, detect_missing_sections, categorize_skills
+from resume_pipeline import analyze_job_pipeline, store_pipeline_result, get_pipeline_result
 from utils import resume_dict_to_text, validate_resume_data
 
 st.set_page_config(page_title="Upload & Analyze Resume", page_icon="📄", layout="wide")
@@ -27,6 +30,18 @@ uploaded_file = st.file_uploader(
     help="Upload a PDF, DOCX, or TXT file"
 )
 
+with st.expander("🎯 Optional: Target Job Description"):
+    st.caption(
+        "Paste a job description to job-match and get suggestions in a single pass. "
+        "Use the same description on the Suggestions and Job Matching pages to reuse the results."
+    )
+    target_job_description = st.text_area(
+        "Target job description",
+        height=150,
+        placeholder="Copy and paste the job description here...",
+        key="pipeline_jd"
+    )
+
 if uploaded_file:
     st.success(f"✅ File uploaded: {uploaded_file.name}")
     
@@ -41,7 +56,20 @@ if uploaded_file:
         # Store in session state for other pages
         st.session_state.parsed_resume = parsed_resume
         st.session_state.resume_dict = resume_dict
-        st.session_state.uploaded_file = uploaded_file
+        st.session_state.uploaded_filename = uploaded_file.name
+        
+        # Match + suggestions for the target job run only on request and are
+        # stored for the Suggestions and Job Matching pages
+        if target_job_description:
+            analysis_ready = get_pipeline_result(resume_dict, target_job_description) is not None
+            if not analysis_ready and st.button("🚀 Analyze Against Target Job", type="primary", key="analyze_target_job"):
+                with st.spinner("🔍 Analyzing your resume against the job..."):
+                    analysis = analyze_job_pipeline(resume_dict, target_job_description)
+                if analysis:
+                    store_pipeline_result(analysis, target_job_description, resume_dict)
+                    analysis_ready = True
+            if analysis_ready:
+                st.success("✅ Job match and suggestions are ready on the **Resume Suggestions** and **Job Matching** pages")
         
         # Tabs for different views
         tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -78,9 +106,13 @@ if uploaded_file:
             # Missing sections analysis
             missing_sections = detect_missing_sections(parsed_resume)
             st.markdown("### Missing/Weak Sections")
-            for section, is_missing in missing_sections.items():
-                if is_missing:
-                    st.info(f"⚠️ {section.replace('_', ' ').title()}: Consider adding or expanding")
+            # One info box for all missing sections instead of one element each
+            missing_lines = "\n".join(
+                f"- ⚠️ {section.replace('_', ' ').title()}: Consider adding or expanding"
+                for section, is_missing in missing_sections.items() if is_missing
+            )
+            if missing_lines:
+                st.info(missing_lines)
         
         with tab2:
             st.subheader("Contact Information")
@@ -207,8 +239,10 @@ if uploaded_file:
             st.info("🎲 Go to **Job Matching** to find suitable roles")
         
         # Display JSON for debugging
+        # Expander bodies run even when collapsed, so only serialize the JSON on request
         with st.expander("🔧 View Parsed JSON (Debug)"):
-            st.json(resume_dict)
+            if st.checkbox("Show parsed JSON", key="show_parsed_json"):
+                st.json(resume_dict)
     
     else:
         st.error("❌ Failed to parse resume. Please try a different file.")
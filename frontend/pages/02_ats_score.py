@@ -6,9 +6,12 @@ import streamlit as st
 import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../backend'))
+# Streamlit re-executes this script on every rerun; add the backend path only once
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '../../backend')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
-from ats_analyzer import calculate_ats_score
+from ats_analyzer import calculate_ats_score, build_resume_text
 from utils import format_ats_score_display
 
 st.set_page_config(page_title="ATS Score", page_icon="🎯", layout="wide")
@@ -41,26 +44,22 @@ if 'parsed_resume' not in st.session_state:
 parsed_resume = st.session_state.parsed_resume
 resume_dict = st.session_state.resume_dict
 
-with st.spinner("📊 Calculating ATS score..."):
-    resume_text = " ".join([
-        str(parsed_resume.name or ""),
-        str(parsed_resume.email or ""),
-        str(parsed_resume.phone or ""),
-        str(parsed_resume.summary or ""),
-        " ".join([s.name for s in parsed_resume.skills]) if parsed_resume.skills else "",
-        " ".join([e.description or "" for e in parsed_resume.experience]) if parsed_resume.experience else "",
-        " ".join([e.degree or "" for e in parsed_resume.education]) if parsed_resume.education else "",
-        " ".join(parsed_resume.certifications) if parsed_resume.certifications else "",
-        " ".join(parsed_resume.projects) if parsed_resume.projects else "",
-    ])
-
-    resume_skills = [s.name for s in parsed_resume.skills] if parsed_resume.skills else []
-
-    ats_result = calculate_ats_score(
-        resume_text,
-        resume_skills,
-        resume_dict
-    )
+# Reruns reuse the score until a new resume object is uploaded
+cached_ats = st.session_state.get('ats_analysis')
+if cached_ats and cached_ats[0] is parsed_resume:
+    ats_result = cached_ats[1]
+else:
+    with st.spinner("📊 Calculating ATS score..."):
+        # One pass over the skills feeds both the text and the skills argument
+        resume_skills = [s.name for s in parsed_resume.skills]
+        resume_text = build_resume_text(parsed_resume, resume_skills)
+
+        ats_result = calculate_ats_score(
+            resume_text,
+            resume_skills,
+            resume_dict
+        )
+    st.session_state.ats_analysis = (parsed_resume, ats_result)
 
 # Display ATS Score
 st.markdown("---")
@@ -6,9 +6,12 @@ import streamlit as st
 import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../backend'))
+# Streamlit re-executes this script on every rerun; add the backend path only once
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '../../backend')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
-from resume_rewriter import generate_resume_suggestions
+from resume_pipeline import analyze_job_pipeline, store_pipeline_result, get_pipeline_result
 
 st.set_page_config(page_title="Resume Suggestions", page_icon="💡", layout="wide")
 
@@ -40,9 +43,20 @@ if not job_description:
     st.info("👆 Paste a job description to get personalized suggestions")
     st.stop()
 
-# Generate suggestions
-with st.spinner("✍️ Generating improvement suggestions..."):
-    feedback = generate_resume_suggestions(resume_dict, job_description)
+# Generate suggestions only on request; widget reruns reuse the stored result
+# (one call also fills in the job match page for the same job description)
+pipeline_result = get_pipeline_result(resume_dict, job_description)
+if pipeline_result:
+    feedback = pipeline_result.feedback
+elif st.button("✨ Generate Suggestions", type="primary", key="generate_suggestions"):
+    with st.spinner("✍️ Generating improvement suggestions..."):
+        pipeline_result = analyze_job_pipeline(resume_dict, job_description)
+    if pipeline_result:
+        store_pipeline_result(pipeline_result, job_description, resume_dict)
+    feedback = pipeline_result.feedback if pipeline_result else None
+else:
+    st.info("👆 Click **Generate Suggestions** to analyze your resume against this job")
+    st.stop()
 
 if feedback:
     st.markdown("---")
@@ -76,32 +90,28 @@ if feedback:
             
             st.markdown("**Why This Helps:**")
             st.info(suggestion.reason)
-            
-            # Action button
-            if st.button(f"Copy Suggestion {i}", key=f"copy_{i}"):
-                st.session_state[f"copied_{i}"] = suggestion.suggested_text
-                st.success("Copied to clipboard!")
+    
+    st.caption("Use the copy icon on a suggested improvement to copy it.")
     
     st.markdown("---")
     
-    # Categorized tips
+    # Categorized tips, rendered as one table grouped by focus area
     st.markdown("## 📚 Writing Tips by Category")
     
-    # Categorize suggestions
-    focus_areas = {}
-    for suggestion in feedback.suggestions:
-        area = suggestion.focus_area.title()
-        if area not in focus_areas:
-            focus_areas[area] = []
-        focus_areas[area].append(suggestion)
-    
-    for area, suggestions in focus_areas.items():
-        with st.expander(f"📌 {area} ({len(suggestions)} tips)"):
-            for idx, sugg in enumerate(suggestions, 1):
-                st.write(f"**{idx}. {sugg.reason}**")
-                st.write(f"Original: {sugg.original_text[:100]}...")
-                st.write(f"Improved: {sugg.suggested_text[:100]}...")
-                st.divider()
+    tips = sorted(feedback.suggestions, key=lambda sugg: sugg.focus_area.title())
+    st.dataframe(
+        [
+            {
+                "Focus": sugg.focus_area.title(),
+                "Why": sugg.reason,
+                "Original": sugg.original_text,
+                "Improved": sugg.suggested_text
+            }
+            for sugg in tips
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
     
 else:
     st.error("❌ Failed to generate suggestions. Please try again.")
@@ -174,12 +184,23 @@ checklist = {
 checked = st.session_state.get("resume_checks", {})
 
 st.markdown("### Review Your Resume Against These Criteria:")
-for item, description in checklist.items():
-    col1, col2 = st.columns([0.1, 0.9])
-    with col1:
-        checked[item] = st.checkbox(item, value=checked.get(item, False))
-    with col2:
-        st.caption(description)
+# One editor widget for the whole checklist. Its rows are only rebuilt from the
+# saved progress when the editor state is gone (first visit or page change),
+# because changing the input data would reset the editor mid-edit.
+if "resume_checklist_editor" not in st.session_state:
+    st.session_state.resume_checklist_rows = [
+        {"Done": checked.get(item, False), "Item": item, "Description": description}
+        for item, description in checklist.items()
+    ]
+edited_checklist = st.data_editor(
+    st.session_state.resume_checklist_rows,
+    key="resume_checklist_editor",
+    column_config={"Done": st.column_config.CheckboxColumn("Done")},
+    disabled=["Item", "Description"],
+    use_container_width=True,
+    hide_index=True
+)
+checked = {row["Item"]: bool(row["Done"]) for row in edited_checklist}
 
 st.session_state.resume_checks = checked
 
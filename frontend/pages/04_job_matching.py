@@ -6,14 +6,17 @@ import streamlit as st
 import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../backend'))
+# Streamlit re-executes this script on every rerun; add the backend path only once
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '../../backend')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from job_matcher import (
-    match_resume_with_job,
+    match_resume_with_sample_jobs,
     get_sample_jobs,
-    get_sample_job_by_index,
-    calculate_simple_skill_match
+    get_sample_job_by_index
 )
+from resume_pipeline import analyze_job_pipeline, store_pipeline_result, get_pipeline_result
 from utils import format_match_percentage, estimate_application_success
 
 st.set_page_config(page_title="Job Matching", page_icon="🎲", layout="wide")
@@ -63,6 +66,14 @@ if input_method == "Use Sample Jobs":
             company_name = sample_job.company
             
             st.success(f"✅ Selected: {job_title} at {company_name}")
+    
+    with st.expander("📊 Compare against all sample jobs"):
+        if st.button("Compare All", key="compare_all_jobs"):
+            all_matches = match_resume_with_sample_jobs(resume_dict)
+            cols = st.columns(len(sample_jobs))
+            for col, job, result in zip(cols, sample_jobs, all_matches):
+                with col:
+                    st.metric(job.title, f"{result.match_percentage}%" if result else "N/A")
 
 else:
     st.markdown("#### Custom Job Description")
@@ -79,9 +90,20 @@ if not job_description:
     st.info("👆 Select or paste a job description to proceed")
     st.stop()
 
-# Perform matching
-with st.spinner("🔍 Analyzing job match..."):
-    match_result = match_resume_with_job(resume_dict, job_description)
+# Perform matching only on request; widget reruns reuse the stored result
+# (one call also fills in the suggestions page for the same job description)
+pipeline_result = get_pipeline_result(resume_dict, job_description)
+if pipeline_result:
+    match_result = pipeline_result.match
+elif st.button("🔍 Analyze Match", type="primary", key="analyze_match"):
+    with st.spinner("🔍 Analyzing job match..."):
+        pipeline_result = analyze_job_pipeline(resume_dict, job_description)
+    if pipeline_result:
+        store_pipeline_result(pipeline_result, job_description, resume_dict)
+    match_result = pipeline_result.match if pipeline_result else None
+else:
+    st.info("👆 Click **Analyze Match** to compare your resume with this job")
+    st.stop()
 
 if match_result:
     st.markdown("---")
@@ -226,9 +248,6 @@ if match_result:
     # Similar roles suggestion
     st.markdown("## 🔍 Skills Analysis")
     
-    # Extract skills from resume and job
-    resume_skills = [s.name for s in parsed_resume.skills] if parsed_resume.skills else []
-    
     st.markdown("### Your Skills vs. Job Requirements")
     st.caption("Skills you have that are relevant:")
     st.write(", ".join(match_result.matching_skills[:5]) if match_result.matching_skills else "None identified")
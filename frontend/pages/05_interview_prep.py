@@ -6,12 +6,16 @@ import streamlit as st
 import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../backend'))
+# Streamlit re-executes this script on every rerun; add the backend path only once
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '../../backend')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from interview_generator import (
     generate_interview_questions,
     generate_simple_questions
 )
+from utils import resume_cache_key, job_description_cache_key
 
 st.set_page_config(page_title="Interview Prep", page_icon="🎤", layout="wide")
 
@@ -63,19 +67,35 @@ if not job_title:
     st.stop()
 
 # Generate questions
-with st.spinner("🎤 Generating interview questions..."):
-    if job_description:
-        # Use AI-generated questions if job description is provided
-        interview_set = generate_interview_questions(
-            resume_dict,
-            job_description,
-            job_title,
-            company_name
-        )
+if job_description:
+    # AI-generated questions run only on request; widget reruns reuse the stored set
+    interview_key = (
+        resume_cache_key(resume_dict),
+        job_description_cache_key(job_description),
+        job_title,
+        company_name
+    )
+    stored_interview = st.session_state.get('interview_result')
+    if stored_interview and stored_interview[0] == interview_key:
+        interview_set = stored_interview[1]
+    elif st.button("🎤 Generate Questions", type="primary", key="generate_questions"):
+        with st.spinner("🎤 Generating interview questions..."):
+            interview_set = generate_interview_questions(
+                resume_dict,
+                job_description,
+                job_title,
+                company_name
+            )
+        # Only successes are kept, so a failed attempt leaves the button for a retry
+        if interview_set:
+            st.session_state.interview_result = (interview_key, interview_set)
     else:
-        # Use template-based questions
-        skills = [s.name for s in parsed_resume.skills] if parsed_resume.skills else []
-        interview_set = generate_simple_questions(skills, job_title)
+        st.info("👆 Click **Generate Questions** to get questions tailored to this job")
+        st.stop()
+else:
+    # Use template-based questions
+    skills = [s.name for s in parsed_resume.skills] if parsed_resume.skills else []
+    interview_set = generate_simple_questions(skills, job_title)
 
 if interview_set:
     st.markdown("---")
@@ -116,16 +136,17 @@ if interview_set:
                     st.markdown("**Tip for answering:**")
                     st.success(question.tip)
                 
-                # Answer space
+                # Answer space, only created when the user chooses to practice
                 st.markdown("---")
-                answer = st.text_area(
-                    "Your answer (practice):",
-                    height=100,
-                    key=f"tech_answer_{i}",
-                    placeholder="Type your answer here to practice..."
-                )
-                if answer:
-                    st.success("✓ Keep this answer prepared!")
+                if st.toggle("✍️ Practice your answer", key=f"practice_tech_{i}"):
+                    answer = st.text_area(
+                        "Your answer (practice):",
+                        height=100,
+                        key=f"tech_answer_{i}",
+                        placeholder="Type your answer here to practice..."
+                    )
+                    if answer:
+                        st.success("✓ Keep this answer prepared!")
     
     with tab2:
         st.markdown("### 👥 Behavioral Questions")
@@ -151,37 +172,38 @@ if interview_set:
                     st.markdown("**Tip for answering:**")
                     st.success(question.tip)
                 
-                # STAR template
+                # STAR template, only created when the user chooses to practice
                 st.markdown("---")
-                st.markdown("**STAR Template:**")
-                col1, col2 = st.columns(2)
-                with col1:
-                    situation = st.text_area(
-                        "Situation:",
-                        height=80,
-                        key=f"star_s_{i}",
-                        placeholder="What was the context?"
-                    )
-                    task = st.text_area(
-                        "Task:",
-                        height=80,
-                        key=f"star_t_{i}",
-                        placeholder="What did you need to do?"
-                    )
+                if st.toggle("✍️ Practice with the STAR template", key=f"practice_star_{i}"):
+                    st.markdown("**STAR Template:**")
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        situation = st.text_area(
+                            "Situation:",
+                            height=80,
+                            key=f"star_s_{i}",
+                            placeholder="What was the context?"
+                        )
+                        task = st.text_area(
+                            "Task:",
+                            height=80,
+                            key=f"star_t_{i}",
+                            placeholder="What did you need to do?"
+                        )
                 
-                with col2:
-                    action = st.text_area(
-                        "Action:",
-                        height=80,
-                        key=f"star_a_{i}",
-                        placeholder="What did you do?"
-                    )
-                    result = st.text_area(
-                        "Result:",
-                        height=80,
-                        key=f"star_r_{i}",
-                        placeholder="What was the outcome?"
-                    )
+                    with col2:
+                        action = st.text_area(
+                            "Action:",
+                            height=80,
+                            key=f"star_a_{i}",
+                            placeholder="What did you do?"
+                        )
+                        result = st.text_area(
+                            "Result:",
+                            height=80,
+                            key=f"star_r_{i}",
+                            placeholder="What was the outcome?"
+                        )
     
     with tab3:
         st.markdown("### 🎯 Role-Specific Questions")
@@ -201,16 +223,17 @@ if interview_set:
                     st.markdown("**Tip for answering:**")
                     st.success(question.tip)
                 
-                # Answer space
+                # Answer space, only created when the user chooses to practice
                 st.markdown("---")
-                answer = st.text_area(
-                    "Your answer (practice):",
-                    height=100,
-                    key=f"role_answer_{i}",
-                    placeholder="Type your answer here to practice..."
-                )
-                if answer:
-                    st.success("✓ Great! Practice this answer multiple times.")
+                if st.toggle("✍️ Practice your answer", key=f"practice_role_{i}"):
+                    answer = st.text_area(
+                        "Your answer (practice):",
+                        height=100,
+                        key=f"role_answer_{i}",
+                        placeholder="Type your answer here to practice..."
+                    )
+                    if answer:
+                        st.success("✓ Great! Practice this answer multiple times.")
     
     with tab4:
         st.markdown("### 📋 Interview Preparation Tips")
@@ -247,8 +270,22 @@ if interview_set:
         st.markdown("**Day Before Checklist:**")
         checklist_state = st.session_state.get("interview_checklist", {})
         
-        for item, _ in checklist_items:
-            checklist_state[item] = st.checkbox(item, value=checklist_state.get(item, False))
+        # One editor widget for the whole checklist, seeded from the saved
+        # progress only when its state is gone (see the resume checklist)
+        if "interview_checklist_editor" not in st.session_state:
+            st.session_state.interview_checklist_rows = [
+                {"Done": checklist_state.get(item, False), "Item": item}
+                for item, _ in checklist_items
+            ]
+        edited_checklist = st.data_editor(
+            st.session_state.interview_checklist_rows,
+            key="interview_checklist_editor",
+            column_config={"Done": st.column_config.CheckboxColumn("Done")},
+            disabled=["Item"],
+            use_container_width=True,
+            hide_index=True
+        )
+        checklist_state = {row["Item"]: bool(row["Done"]) for row in edited_checklist}
         
         st.session_state.interview_checklist = checklist_state
         
@@ -4,9 +4,16 @@ Main Streamlit Application
 """
 
 import streamlit as st
-import google.generativeai as genai
+import sys
 import os
 
+# Streamlit re-executes this script on every rerun; add the backend path only once
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '../backend')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from gemini_client import configure_api, start_warm_up
+
 # Configure page
 st.set_page_config(
     page_title="AI Career & Resume Optimizer",
@@ -15,28 +22,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Configure API
-@st.cache_resource
-def init_api():
-    """Initialize Google Gemini API."""
-    try:
-        GOOGLE_API_KEY = st.secrets.get("GOOGLE_API_KEY")
-        if not GOOGLE_API_KEY:
-            # Try to load from environment variable
-            GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-        
-        if GOOGLE_API_KEY:
-            genai.configure(api_key=GOOGLE_API_KEY)
-            return True
-        else:
-            return False
-    except Exception as e:
-        st.error(f"API Configuration Error: {e}")
-        return False
-
-
 # Initialize API
-if not init_api():
+if not configure_api():
     st.error("⚠️ Google API Key not configured!")
     st.info("""
     **Setup Instructions:**
@@ -52,8 +39,10 @@ if not init_api():
     """)
     st.stop()
 
+# Open the Gemini connection while the user reads this page
+start_warm_up()
 
-# Custom CSS
+# Custom CSS and header, sent as a single element
 st.markdown("""
 <style>
     .main-header {
@@ -87,11 +76,18 @@ st.markdown("""
         border-radius: 8px;
         border-left: 4px solid #28a745;
     }
+    .feature-grid {
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        gap: 1rem;
+    }
+    @media (max-width: 640px) {
+        .feature-grid {
+            grid-template-columns: 1fr;
+        }
+    }
 </style>
-""", unsafe_allow_html=True)
 
-# Header
-st.markdown("""
 <div class="main-header">🚀 AI Career & Resume Optimizer</div>
 <div class="subtitle">Elevate Your Career with AI-Powered Resume Analysis</div>
 """, unsafe_allow_html=True)
@@ -119,27 +115,29 @@ with tab1:
     """)
 
 with tab2:
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        ### 💼 Candidate Tools
-        
-        - **Resume Upload & Parsing**: Upload PDF/DOCX resumes
-        - **ATS Score Analysis**: See your resume's ATS compatibility
-        - **Skill Assessment**: Get detailed skill breakdown
-        - **Content Suggestions**: Improve bullet points and wording
-        """)
-    
-    with col2:
-        st.markdown("""
-        ### 👔 Recruiter Tools
-        
-        - **Batch Analysis**: Process multiple resumes quickly
-        - **Job Description Matching**: Compare resumes to job specs
-        - **Candidate Ranking**: Automatic scoring and ranking
-        - **Interview Questions**: Generate role-specific questions
-        """)
+    # Two-column feature list as one element; stacks on narrow screens like st.columns
+    st.markdown("""
+    <div class="feature-grid">
+    <div>
+    <h3>💼 Candidate Tools</h3>
+    <ul>
+    <li><strong>Resume Upload &amp; Parsing</strong>: Upload PDF/DOCX resumes</li>
+    <li><strong>ATS Score Analysis</strong>: See your resume's ATS compatibility</li>
+    <li><strong>Skill Assessment</strong>: Get detailed skill breakdown</li>
+    <li><strong>Content Suggestions</strong>: Improve bullet points and wording</li>
+    </ul>
+    </div>
+    <div>
+    <h3>👔 Recruiter Tools</h3>
+    <ul>
+    <li><strong>Batch Analysis</strong>: Process multiple resumes quickly</li>
+    <li><strong>Job Description Matching</strong>: Compare resumes to job specs</li>
+    <li><strong>Candidate Ranking</strong>: Automatic scoring and ranking</li>
+    <li><strong>Interview Questions</strong>: Generate role-specific questions</li>
+    </ul>
+    </div>
+    </div>
+    """, unsafe_allow_html=True)
 
 with tab3:
     st.markdown("""
@@ -160,22 +158,10 @@ with tab3:
     - **Streamlit**: Interactive user interface
     """)
 
-# Navigation
-st.sidebar.markdown("---")
-st.sidebar.title("🗂️ Navigation")
-
-pages = {
-    "📄 Upload & Analyze": "pages/01_upload_resume.py",
-    "🎯 ATS Score": "pages/02_ats_score.py",
-    "💡 Resume Suggestions": "pages/03_resume_suggestions.py",
-    "🎲 Job Matching": "pages/04_job_matching.py",
-    "🎤 Interview Prep": "pages/05_interview_prep.py",
-}
-
-selected_page = st.sidebar.radio("Choose an option:", list(pages.keys()))
-
-st.sidebar.markdown("---")
+# Sidebar (page navigation is Streamlit's own page list from the pages/ directory)
 st.sidebar.markdown("""
+---
+
 ### 📚 About This Project
 **AI-Based Career & Resume Optimization System**
 
@@ -190,9 +176,9 @@ A comprehensive final-year B.Tech project designed to help:
 """)
 
 # Main content area
-st.markdown("---")
-
 st.markdown("""
+---
+
 ### Getting Started 🚀
 
 1. **For Job Seekers**: Go to "Upload & Analyze" to start your resume analysis
@@ -206,15 +192,18 @@ st.markdown("""
 - Average ATS parse failure rate: 25% of resumes
 - Keywords matter: 60% of hiring decisions depend on relevant keywords
 - Optimization can increase your chances by up to 40%
-""")
 
-st.markdown("---")
+---
+""")
 
 # Footer
 col1, col2, col3 = st.columns(3)
 with col1:
     st.info("💡 **Tip**: Use realistic job descriptions for accurate analysis")
 with col2:
-    st.success("✅ **Data Privacy**: Your data is processed locally and not stored")
+    st.success(
+        "✅ **Data Privacy**: ATS scoring runs on this server; AI features send resume text to Google Gemini, "
+        "and responses are cached on the server's disk (`.llm_cache/`) until evicted or cleared"
+    )
 with col3:
     st.warning("⚠️ **Accuracy**: AI scores are estimations, not guarantees")